@@ -1,6 +1,8 @@
 import ai2thor.server
 from typing import List, Dict, Tuple
+from collections import defaultdict
 import re
+import sys
 from typing import Optional
 
 class EventObject:
@@ -16,27 +18,38 @@ class EventObject:
         
         # 保持向后兼容性 (但会有同名物体覆盖警告)
         self.item2object = enhanced_mapping["by_name"]    # name -> object (兼容性)  
+        
+        # 名称查找索引：首次调用 find_object_id_by_name 时才构建，查询结果按模式缓存
+        self._lower_names = None
+        self._name_pattern2ids = {}
 
 
     def get_objects(self) -> Tuple[List[dict], Dict[str, dict]]:
-        id2objects = {}  # objectId -> object mapping (唯一映射)
-        type2objects = {}  # objectType -> [objects] mapping (类型到实例列表)
+        objects = self.objects
+        # 先按列抽取字段，再批量构建映射
+        ids = [item["objectId"] for item in objects]
+        # objectType取值很少，驻留后作为字典键可按指针比较
+        _intern = sys.intern
+        types = [_intern(item["objectType"]) for item in objects]
+        names = [item["name"] for item in objects]
         
-        for item in self.objects:
-            # 使用唯一ID作为主映射键，解决同名物体混淆问题
-            id2objects[item["objectId"]] = item
-            
-            # 维护类型到实例列表的映射，支持按类型查找
-            if item["objectType"] not in type2objects:
-                type2objects[item["objectType"]] = []
-            type2objects[item["objectType"]].append(item)
+        # 使用唯一ID作为主映射键，解决同名物体混淆问题
+        id2objects = dict(zip(ids, objects))  # objectId -> object mapping (唯一映射)
+        
+        # 维护类型到实例列表的映射，支持按类型查找
+        type2objects = defaultdict(list)  # objectType -> [objects] mapping (类型到实例列表)
+        for obj_type, item in zip(types, objects):
+            type2objects[obj_type].append(item)
+        type2objects = dict(type2objects)
         
         # 为了兼容性，也保留旧的name映射（但会有覆盖问题的警告）
-        name2object = {}
-        for item in self.objects:
-            if item["name"] in name2object:
-                print(f"⚠️ Warning: Duplicate object name '{item['name']}' detected. It is recommended to use objectId for precise access.")
-            name2object[item["name"]] = item
+        name2object = dict(zip(names, objects))
+        if len(name2object) != len(objects):
+            seen = set()
+            for name in names:
+                if name in seen:
+                    print(f"⚠️ Warning: Duplicate object name '{name}' detected. It is recommended to use objectId for precise access.")
+                seen.add(name)
             
         enhanced_mapping = {
             "by_id": id2objects,      # 推荐使用：按唯一ID映射
@@ -167,11 +180,14 @@ class EventObject:
     
     def find_object_id_by_name(self, name_pattern: str) -> List[str]:
         """根据名称模式查找匹配的objectId列表"""
-        matching_ids = []
-        for object_id, obj in self.id2object.items():
-            if name_pattern.lower() in obj["name"].lower():
-                matching_ids.append(object_id)
-        return matching_ids
+        pattern = name_pattern.lower()
+        matching_ids = self._name_pattern2ids.get(pattern)
+        if matching_ids is None:
+            if self._lower_names is None:
+                self._lower_names = [(object_id, obj["name"].lower()) for object_id, obj in self.id2object.items()]
+            matching_ids = [object_id for object_id, name in self._lower_names if pattern in name]
+            self._name_pattern2ids[pattern] = matching_ids
+        return list(matching_ids)
 
 
 def extract_item(response):
@@ -1,6 +1,8 @@
 import ai2thor.server
 from typing import List, Dict, Tuple
+from collections import defaultdict
 import re
+import sys
 # from .prompt import INSTRUCTION2ITEM_PROMPT
 import openai
 import cv2
@@ -13,25 +15,31 @@ class EventObject:
 
     @staticmethod
     def get_objects(event) -> Tuple[List[dict], Dict[str, dict]]:
-        id2object = {}  # objectId -> object mapping (唯一映射)
-        type2objects = {}  # objectType -> [objects] mapping (类型到实例列表)
         objects = event.metadata["objects"]
+        # 先按列抽取字段，再批量构建映射
+        ids = [item["objectId"] for item in objects]
+        # objectType取值很少，驻留后作为字典键可按指针比较
+        _intern = sys.intern
+        types = [_intern(item["objectType"]) for item in objects]
+        names = [item["name"] for item in objects]
         
-        for item in objects:
-            # 使用唯一ID作为主映射键，解决同名物体混淆问题
-            id2object[item["objectId"]] = item
-            
-            # 维护类型到实例列表的映射，支持按类型查找
-            if item["objectType"] not in type2objects:
-                type2objects[item["objectType"]] = []
-            type2objects[item["objectType"]].append(item)
+        # 使用唯一ID作为主映射键，解决同名物体混淆问题
+        id2object = dict(zip(ids, objects))  # objectId -> object mapping (唯一映射)
+        
+        # 维护类型到实例列表的映射，支持按类型查找
+        type2objects = defaultdict(list)  # objectType -> [objects] mapping (类型到实例列表)
+        for obj_type, item in zip(types, objects):
+            type2objects[obj_type].append(item)
+        type2objects = dict(type2objects)
         
         # 为了兼容性，也保留旧的name映射（但会有覆盖问题的警告）
-        item2object = {}
-        for item in objects:
-            if item["name"] in item2object:
-                print(f"⚠️ Warning: Duplicate object name '{item['name']}' detected. It is recommended to use objectId for precise access.")
-            item2object[item["name"]] = item
+        item2object = dict(zip(names, objects))
+        if len(item2object) != len(objects):
+            seen = set()
+            for name in names:
+                if name in seen:
+                    print(f"⚠️ Warning: Duplicate object name '{name}' detected. It is recommended to use objectId for precise access.")
+                seen.add(name)
             
         enhanced_mapping = {
             "by_id": id2object,      # 推荐使用：按唯一ID映射
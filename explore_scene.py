@@ -5,81 +5,164 @@ sys.path.append('evaluate')
 
 from ai2thor.controller import Controller
 from ai2thor.platform import CloudRendering
-from collections import defaultdict
 import json
+import multiprocessing
+import signal
 
-def explore_scene_objects(scene_name="FloorPlan1"):
-    """Explore objects in a scene to find multiple objects of same type."""
+import numpy as np
+
+# Only object metadata is read, so frames are kept as small as possible
+CONTROLLER_KWARGS = dict(
+    platform=CloudRendering,
+    snapToGrid=False,
+    quality='Low',
+    agentMode="default",
+    massThreshold=None,
+    visibilityDistance=20,
+    gridSize=0.1,
+    renderDepthImage=False,
+    renderInstanceSegmentation=False,
+    width=300,
+    height=300,
+    fieldOfView=90,
+)
+
+def explore_scene_objects(controller, scene_name="FloorPlan1", reset=True):
+    """Explore objects in a scene to find multiple objects of same type.
     
-    controller = Controller(
-        platform=CloudRendering,
-        snapToGrid=False,
-        quality='Medium',
-        agentMode="default",
-        massThreshold=None,
-        scene=scene_name,
-        visibilityDistance=20,
-        gridSize=0.1,
-        renderDepthImage=False,
-        renderInstanceSegmentation=False,
-        width=800,
-        height=450,
-        fieldOfView=90,
-    )
+    The given controller is reset to ``scene_name`` rather than spawning a
+    new Unity process per scene; the caller owns it and stops it. Pass
+    ``reset=False`` when the controller was just created with that scene,
+    so it is not loaded twice.
+    """
     
-    # Get all objects in scene
-    event = controller.step(dict(action='Pass'))
+    if reset:
+        controller.reset(scene=scene_name)
+    
+    # Get all objects in scene; only metadata is read, so skip the frame
+    event = controller.step(dict(action='Pass', renderImage=False))
     objects = event.metadata['objects']
     
-    # Group objects by type
-    object_types = defaultdict(list)
-    for obj in objects:
-        object_types[obj['objectType']].append(obj)
+    # Structure-of-arrays view of the scene, grouped by type in one pass
+    object_ids = [obj['objectId'] for obj in objects]
+    types = np.array([obj['objectType'] for obj in objects])
+    positions = np.array(
+        [[obj['position']['x'], obj['position']['y'], obj['position']['z']] for obj in objects],
+        dtype=np.float64
+    ).reshape(-1, 3)
+    visible = np.array([bool(obj.get('visible', False)) for obj in objects], dtype=bool)
+    pickupable = np.array([bool(obj.get('pickupable', False)) for obj in objects], dtype=bool)
+    
+    uniq, first_index, inverse, counts = np.unique(
+        types, return_index=True, return_inverse=True, return_counts=True
+    )
+    # Member indices of each type, in scene order
+    members = np.split(np.argsort(inverse.ravel(), kind='stable'), np.cumsum(counts)[:-1])
     
-    print(f"=== Objects in {scene_name} ===")
-    print(f"Total objects: {len(objects)}")
-    print("\nObjects with multiple instances:")
+    # The report is built as a list of lines and written in one call
+    lines = [
+        f"=== Objects in {scene_name} ===",
+        f"Total objects: {len(objects)}",
+        "\nObjects with multiple instances:",
+    ]
     
     disambiguation_candidates = []
     
-    for obj_type, obj_list in object_types.items():
-        if len(obj_list) > 1:
-            print(f"\n{obj_type}: {len(obj_list)} instances")
-            for i, obj in enumerate(obj_list):
-                pos = obj['position']
-                print(f"  {i+1}. {obj['objectId']} at ({pos['x']:.2f}, {pos['y']:.2f}, {pos['z']:.2f})")
-                if obj.get('visible', False):
-                    print(f"     Visible: {obj['visible']}")
-                if obj.get('pickupable', False):
-                    print(f"     Pickupable: {obj['pickupable']}")
-            
-            # Good candidates for disambiguation testing
-            if len(obj_list) >= 2 and any(obj.get('pickupable', False) for obj in obj_list):
-                disambiguation_candidates.append(obj_type)
+    # Types in first-appearance order, only those with several instances
+    for k in np.argsort(first_index):
+        if counts[k] < 2:
+            continue
+        obj_type = str(uniq[k])
+        lines.append(f"\n{obj_type}: {counts[k]} instances")
+        lines.extend(
+            f"  {i+1}. {object_ids[j]} at ({positions[j, 0]:.2f}, {positions[j, 1]:.2f}, {positions[j, 2]:.2f})"
+            + ("\n     Visible: True" if visible[j] else "")
+            + ("\n     Pickupable: True" if pickupable[j] else "")
+            for i, j in enumerate(members[k])
+        )
+        
+        # Good candidates for disambiguation testing
+        if pickupable[members[k]].any():
+            disambiguation_candidates.append(obj_type)
     
-    print(f"\n=== Good candidates for disambiguation testing ===")
-    for candidate in disambiguation_candidates:
-        print(f"- {candidate}")
+    lines.append(f"\n=== Good candidates for disambiguation testing ===")
+    lines.extend(f"- {candidate}" for candidate in disambiguation_candidates)
+    sys.stdout.write("\n".join(lines) + "\n")
     
-    controller.stop()
     return disambiguation_candidates
 
+def _exit_on_sigterm(signum, frame):
+    """Unwind a pool worker on SIGTERM so its finally block stops the controller."""
+    raise SystemExit(128 + signum)
+
+def _init_worker():
+    """Pool initializer: Pool.terminate() sends SIGTERM, which by default
+    kills the worker without running controller.stop() and leaves Unity running."""
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+def _explore_scene_batch(scene_names):
+    """Explore a batch of scenes in one worker process on one controller.
+    
+    Top-level so it can be pickled for spawned workers.
+    """
+    results = {}
+    controller = Controller(scene=scene_names[0], **CONTROLLER_KWARGS)
+    try:
+        for i, scene_name in enumerate(scene_names):
+            try:
+                # The first scene was loaded when the controller was created
+                results[scene_name] = explore_scene_objects(controller, scene_name, reset=i > 0)
+            except Exception as e:
+                print(f"Error with {scene_name}: {e}")
+    finally:
+        controller.stop()
+    return results
+
+def sweep_scenes(scene_names, processes=4, timeout=60):
+    """Explore several scenes in parallel worker processes.
+    
+    Scenes are split into one batch per process; each worker owns its own
+    Python interpreter and Unity process, so neither metadata handling nor
+    rendering is serialized by the GIL. Workers are spawned rather than
+    forked to keep Unity state out of the children. A batch that has not
+    finished within ``timeout`` seconds per scene is skipped.
+    
+    Returns:
+        Dict mapping scene name to its disambiguation candidates.
+    """
+    processes = max(1, min(processes, len(scene_names)))
+    batches = [scene_names[k::processes] for k in range(processes)]
+    
+    results = {}
+    with multiprocessing.get_context('spawn').Pool(processes=processes, initializer=_init_worker) as pool:
+        pending = [(batch, pool.apply_async(_explore_scene_batch, (batch,))) for batch in batches]
+        for batch, async_result in pending:
+            try:
+                results.update(async_result.get(timeout=timeout * len(batch)))
+            except multiprocessing.TimeoutError:
+                print(f"Skipping {', '.join(batch)}: no result after {timeout * len(batch)}s")
+            except Exception as e:
+                print(f"Error with {', '.join(batch)}: {e}")
+    return results
+
 if __name__ == "__main__":
-    candidates = explore_scene_objects("FloorPlan1")
+    controller = Controller(scene="FloorPlan1", **CONTROLLER_KWARGS)
+    try:
+        candidates = explore_scene_objects(controller, "FloorPlan1", reset=False)
+    finally:
+        # Stop before sweeping; each worker starts its own Unity process
+        controller.stop()
     
     if candidates:
         print(f"\nFound {len(candidates)} object types with multiple instances for testing!")
     else:
         print("\nNo multiple objects found in FloorPlan1. Let's try other scenes...")
         
-        # Try other FloorPlans
-        for scene_num in [2, 3, 4, 5]:
-            scene_name = f"FloorPlan{scene_num}"
-            print(f"\n=== Trying {scene_name} ===")
-            try:
-                candidates = explore_scene_objects(scene_name)
-                if candidates:
-                    print(f"Found candidates in {scene_name}!")
-                    break
-            except Exception as e:
-                print(f"Error with {scene_name}: {e}")
\ No newline at end of file
+        # Try other FloorPlans concurrently, reporting the first in order
+        scene_names = [f"FloorPlan{scene_num}" for scene_num in [2, 3, 4, 5]]
+        print(f"\n=== Trying {', '.join(scene_names)} ===")
+        found = sweep_scenes(scene_names)
+        for scene_name in scene_names:
+            if found.get(scene_name):
+                print(f"Found candidates in {scene_name}!")
+                break
@@ -23,12 +23,22 @@ def integrate_spatial_enhancement():
     target_dir = eval_dir / "spatial_enhancement"
     target_dir.mkdir(exist_ok=True)
     
-    # Copy all modules
+    # Copy all modules, skipping targets that are already up to date.
+    # Source files need only their content, not stat/xattr metadata.
     source_dir = Path("spatial_enhancement")
-    for py_file in source_dir.glob("*.py"):
-        target_file = target_dir / py_file.name
-        shutil.copy2(py_file, target_file)
-        print(f"  ✓ Copied {py_file.name}")
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            if not (entry.name.endswith('.py') and entry.is_file()):
+                continue
+            target_file = os.path.join(target_dir, entry.name)
+            try:
+                if os.stat(target_file).st_mtime >= entry.stat().st_mtime:
+                    print(f"  ✓ Up to date {entry.name}")
+                    continue
+            except FileNotFoundError:
+                pass
+            shutil.copyfile(entry.path, target_file)
+            print(f"  ✓ Copied {entry.name}")
     
     # 2. Create enhanced RocAgent wrapper
     print("\n2. Creating enhanced RocAgent wrapper...")
@@ -54,11 +64,9 @@ try:
             # Extract enhancement flag
             enable_enhancements = kwargs.pop('enable_spatial_enhancements', True)
             
-            # Initialize original RocAgent first
-            OriginalRocAgent.__init__(self, *args, **kwargs)
-            
-            # Then initialize enhancements
-            BaseEnhancedRocAgent.__init__(self, *args, **kwargs, enable_enhancements=enable_enhancements)
+            # Single cooperative call: RocAgent's scene initialization runs
+            # once, followed by the enhancement modules
+            super().__init__(*args, enable_enhancements=enable_enhancements, **kwargs)
             
         def navigate(self, itemtype, itemname=None):
             """Override navigate to use enhanced functionality."""
@@ -80,8 +88,7 @@ except ImportError as e:
 '''
     
     enhanced_wrapper_file = eval_dir / "EnhancedRocAgent.py"
-    with open(enhanced_wrapper_file, 'w', encoding='utf-8') as f:
-        f.write(enhanced_rocagent_code)
+    enhanced_wrapper_file.write_text(enhanced_rocagent_code, encoding='utf-8')
     print(f"  ✓ Created {enhanced_wrapper_file}")
     
     # 3. Modify evaluation script to use enhanced agent
@@ -122,8 +129,7 @@ except ImportError:
 ''' + enhanced_content
         
         enhanced_eval_script = Path("evaluate/evaluate_enhanced.py")
-        with open(enhanced_eval_script, 'w', encoding='utf-8') as f:
-            f.write(enhanced_content)
+        enhanced_eval_script.write_text(enhanced_content, encoding='utf-8')
         print(f"  ✓ Created enhanced evaluation script: {enhanced_eval_script}")
     
     # 4. Create integration test with real AI2-THOR
@@ -133,9 +139,49 @@ except ImportError:
 """Real integration test with AI2-THOR environment."""
 
 import json
+import pickle
 import time
 from pathlib import Path
 
+CACHE_DIR = Path(".cache")
+
+CONTROLLER_KWARGS = dict(
+    visibilityDistance=1.5,
+    gridSize=0.25,
+    fieldOfView=90,
+    headless=True,  # For testing
+    width=300,
+    height=300
+)
+
+def get_scene_objects(scene):
+    """Return the metadata object list of a freshly loaded scene, cached on disk.
+    
+    The list is pickled per scene, controller kwargs and ai2thor version, so
+    repeated runs that only inspect the object list skip starting Unity.
+    """
+    import ai2thor
+    
+    cache_key = (scene, sorted(CONTROLLER_KWARGS.items()), ai2thor.__version__)
+    cache_file = CACHE_DIR / f"{scene}_objects.pkl"
+    if cache_file.exists():
+        with open(cache_file, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('key') == cache_key:
+            return cached['objects']
+    
+    from ai2thor.controller import Controller
+    controller = Controller(scene=scene, **CONTROLLER_KWARGS)
+    try:
+        objects = controller.last_event.metadata['objects']
+    finally:
+        controller.stop()
+    
+    CACHE_DIR.mkdir(exist_ok=True)
+    with open(cache_file, 'wb') as f:
+        pickle.dump({'key': cache_key, 'objects': objects}, f)
+    return objects
+
 def test_enhanced_evaluation():
     """Test enhanced evaluation with real AI2-THOR scenes."""
     
@@ -145,16 +191,18 @@ def test_enhanced_evaluation():
         # Try to import AI2-THOR
         from ai2thor.controller import Controller
         
+        # Get available objects; reruns read them from the cache without starting Unity
+        objects = get_scene_objects("FloorPlan1")
+        books = [obj for obj in objects if obj['objectType'] == 'Book']
+        
+        if not books:
+            print("  ⚠️ No books found in scene for testing")
+            return False
+        
+        print(f"  📚 Found {len(books)} book(s) in scene")
+        
         # Test basic controller creation
-        controller = Controller(
-            scene="FloorPlan1",
-            visibilityDistance=1.5,
-            gridSize=0.25,
-            fieldOfView=90,
-            headless=True,  # For testing
-            width=300,
-            height=300
-        )
+        controller = Controller(scene="FloorPlan1", **CONTROLLER_KWARGS)
         
         print("  ✓ AI2-THOR controller created successfully")
         
@@ -171,32 +219,20 @@ def test_enhanced_evaluation():
             
             print("  ✓ EnhancedRocAgent created successfully")
             
-            # Test navigation to a common object
+            # Test enhanced navigation
             print("  🔍 Testing navigation to 'Book'...")
+            result = agent.navigate('Book')
             
-            # Get available objects
-            objects = controller.last_event.metadata['objects']
-            books = [obj for obj in objects if obj['objectType'] == 'Book']
-            
-            if books:
-                print(f"  📚 Found {len(books)} book(s) in scene")
+            if result[0]:  # image_fp
+                print("  ✅ Enhanced navigation successful!")
                 
-                # Test enhanced navigation
-                result = agent.navigate('Book')
+                # Get enhancement stats
+                stats = agent.get_enhancement_stats()
+                print(f"  📊 Enhancement stats: {stats}")
                 
-                if result[0]:  # image_fp
-                    print("  ✅ Enhanced navigation successful!")
-                    
-                    # Get enhancement stats
-                    stats = agent.get_enhancement_stats()
-                    print(f"  📊 Enhancement stats: {stats}")
-                    
-                    return True
-                else:
-                    print("  ⚠️ Navigation returned no result")
-                    return False
+                return True
             else:
-                print("  ⚠️ No books found in scene for testing")
+                print("  ⚠️ Navigation returned no result")
                 return False
                 
         except Exception as e:
@@ -291,8 +327,7 @@ if __name__ == "__main__":
 '''
     
     real_test_file = Path("test_real_integration.py")
-    with open(real_test_file, 'w', encoding='utf-8') as f:
-        f.write(real_test_code)
+    real_test_file.write_text(real_test_code, encoding='utf-8')
     print(f"  ✓ Created real integration test: {real_test_file}")
     
     # 5. Create usage documentation
@@ -441,8 +476,7 @@ Lower `fallback_uses` indicates better enhancement effectiveness.
 '''
     
     integration_doc_file = Path("SPATIAL_ENHANCEMENT_INTEGRATION.md")
-    with open(integration_doc_file, 'w', encoding='utf-8') as f:
-        f.write(integration_doc)
+    integration_doc_file.write_text(integration_doc, encoding='utf-8')
     print(f"  ✓ Created integration documentation: {integration_doc_file}")
     
     print("\n✅ Spatial enhancement integration completed!")
@@ -6,32 +6,50 @@ AI2THOR 环境测试脚本
 
 from ai2thor.controller import Controller
 from ai2thor.platform import CloudRendering
+import math
 import os
 import time
+from functools import lru_cache
 
-def test_ai2thor_basic():
+# 两个测试共用同一个 Controller 的配置
+WIDTH, HEIGHT, FOV = 300, 300, 90
+# 相机内参测试检查的分辨率（与原先单独创建的 800x450 Controller 一致）
+INTRINSICS_WIDTH, INTRINSICS_HEIGHT = 800, 450
+
+@lru_cache(maxsize=8)
+def _inv_half_tan(fov_deg):
+    """焦距系数 1 / (2 tan(fov/2))，每个 FOV 只计算一次；fx = width * 系数"""
+    return 1.0 / (2.0 * math.tan(math.radians(fov_deg) / 2.0))
+
+def create_controller():
+    """创建两个测试共用的 Controller，只加载一次场景"""
+    print("1. 创建 AI2THOR Controller...")
+    controller = Controller(
+        scene="FloorPlan1",
+        renderDepthImage=True,
+        renderInstanceSegmentation=True,
+        width=WIDTH,
+        height=HEIGHT,
+        fieldOfView=FOV,
+        platform=CloudRendering
+    )
+    print("✓ Controller 创建成功")
+    return controller
+
+def test_ai2thor_basic(controller):
     """基础 AI2THOR 功能测试"""
     print("=== AI2THOR 基础功能测试 ===")
     
     try:
-        # 创建控制器
-        print("1. 创建 AI2THOR Controller...")
-        controller = Controller(
-            scene="FloorPlan1",
-            renderDepthImage=True,
-            renderInstanceSegmentation=True,
-            width=300,
-            height=300,
-            fieldOfView=90,
-            platform=CloudRendering
-        )
-        print("✓ Controller 创建成功")
-        
         # 获取初始状态
         print("2. 获取初始状态...")
-        event = controller.step("Pass")
-        print(f"✓ Agent位置: {event.metadata['agent']['position']}")
-        print(f"✓ 场景: {event.metadata['sceneName']}")
+        # Controller 初始化时已执行过一步，直接复用 last_event
+        event = controller.last_event or controller.step("Pass")
+        meta = event.metadata
+        agent = meta['agent']
+        objs = meta['objects']
+        print(f"✓ Agent位置: {agent['position']}")
+        print(f"✓ 场景: {meta['sceneName']}")
         
         # 测试深度图获取
         print("3. 测试深度图获取...")
@@ -49,71 +67,60 @@ def test_ai2thor_basic():
             
         # 测试物体列表
         print("5. 测试物体列表...")
-        objects = event.metadata['objects']
-        visible_objects = [obj for obj in objects if obj['visible']]
-        print(f"✓ 场景中物体总数: {len(objects)}")
+        visible_objects = [obj for obj in objs if obj['visible']]
+        print(f"✓ 场景中物体总数: {len(objs)}")
         print(f"✓ 可见物体数量: {len(visible_objects)}")
         
         # 显示前5个可见物体
         print("前5个可见物体:")
-        for i, obj in enumerate(visible_objects[:5]):
-            print(f"  - {obj['objectType']}: {obj['objectId']}")
+        if visible_objects:
+            print("\n".join(f"  - {obj['objectType']}: {obj['objectId']}" for obj in visible_objects[:5]))
             
         # 测试基础移动
         print("6. 测试基础移动...")
-        move_event = controller.step("MoveAhead")
-        if move_event.metadata['lastActionSuccess']:
+        move_meta = controller.step("MoveAhead").metadata
+        if move_meta['lastActionSuccess']:
             print("✓ 前进移动成功")
-            new_pos = move_event.metadata['agent']['position']
+            new_pos = move_meta['agent']['position']
             print(f"✓ 新位置: {new_pos}")
         else:
             print("⚠ 移动失败")
             
         # 测试旋转
         print("7. 测试旋转...")
-        rotate_event = controller.step("RotateRight")
-        if rotate_event.metadata['lastActionSuccess']:
+        rotate_meta = controller.step("RotateRight").metadata
+        if rotate_meta['lastActionSuccess']:
             print("✓ 右转成功")
-            new_rotation = rotate_event.metadata['agent']['rotation']
+            new_rotation = rotate_meta['agent']['rotation']
             print(f"✓ 新旋转角度: {new_rotation}")
         else:
             print("⚠ 旋转失败")
         
-        # 清理
-        controller.stop()
-        print("✓ Controller 已关闭")
-        
         return True
         
     except Exception as e:
         print(f"❌ AI2THOR 测试失败: {e}")
         return False
 
-def test_camera_intrinsics():
-    """测试相机内参获取"""
+def test_camera_intrinsics(controller):
+    """测试相机内参获取
+    
+    内参只依赖 FOV 和分辨率，按 800x450 直接计算，无需为此再创建
+    Controller；裁剪平面与分辨率无关，直接读取已有的 last_event。
+    """
     print("\n=== 相机内参测试 ===")
     
     try:
-        controller = Controller(
-            scene="FloorPlan1",
-            renderDepthImage=True,
-            width=800,
-            height=450,
-            fieldOfView=90
-        )
-        
-        event = controller.step("Pass")
+        meta = controller.last_event.metadata
         
         # 获取相机内参
-        if 'cameraClippingPlanes' in event.metadata:
-            clipping = event.metadata['cameraClippingPlanes']
+        if 'cameraClippingPlanes' in meta:
+            clipping = meta['cameraClippingPlanes']
             print(f"✓ 相机裁剪平面: {clipping}")
             
         # 计算焦距（基于FOV）
-        import math
-        fov_rad = math.radians(90)  # FOV in radians
-        width, height = 800, 450
-        fx = width / (2 * math.tan(fov_rad / 2))
+        width, height = INTRINSICS_WIDTH, INTRINSICS_HEIGHT
+        fx = width * _inv_half_tan(FOV)
         fy = fx  # 假设方形像素
         cx, cy = width / 2, height / 2
         
@@ -121,7 +128,6 @@ def test_camera_intrinsics():
         print(f"  fx = {fx:.2f}, fy = {fy:.2f}")
         print(f"  cx = {cx:.2f}, cy = {cy:.2f}")
         
-        controller.stop()
         return True
         
     except Exception as e:
@@ -133,11 +139,25 @@ def main():
     print("开始 AI2THOR 环境验证...")
     print(f"当前工作目录: {os.getcwd()}")
     
-    # 基础功能测试
-    basic_success = test_ai2thor_basic()
+    try:
+        controller = create_controller()
+    except Exception as e:
+        print(f"❌ AI2THOR 测试失败: {e}")
+        controller = None
     
-    # 相机内参测试
-    camera_success = test_camera_intrinsics()
+    if controller is not None:
+        try:
+            # 基础功能测试
+            basic_success = test_ai2thor_basic(controller)
+            
+            # 相机内参测试
+            camera_success = test_camera_intrinsics(controller)
+        finally:
+            # 清理
+            controller.stop()
+            print("✓ Controller 已关闭")
+    else:
+        basic_success = camera_success = False
     
     # 总结
     print("\n=== 测试结果总结 ===")
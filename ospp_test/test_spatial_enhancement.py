@@ -183,6 +183,95 @@ def test_integration_with_test_framework():
         traceback.print_exc()
         return False
 
+def _comparison_candidate_lists():
+    """Candidate lists shared by the array/batch comparison tests (empty, single, several)."""
+    def book(i, x, z, visible=True):
+        return {
+            'objectId': f'Book_{i}',
+            'objectType': 'Book',
+            'position': {'x': x, 'y': 0.5, 'z': z},
+            'visible': visible
+        }
+    
+    return [
+        [],
+        [book(1, 1.0, 2.0)],
+        [book(1, 1.0, 2.0), book(2, -1.0, 2.0), book(3, 0.0, 4.0)],
+        [book(1, 0.5, 0.5, False), book(2, -2.0, -1.0), book(3, 3.0, 0.5), book(4, -0.5, 1.0)],
+        [book(1, 1.0, 1.0, False), book(2, -1.0, -1.0, False)],
+        [book(1, 1.0, 0.0), book(2, 0.0, 1.0), book(3, -1.0, 0.0)],  # equal distances
+    ]
+
+def test_spatial_match_array_variants():
+    """find_best_spatial_match_arr/_batch must agree with find_best_spatial_match."""
+    print("\nTesting spatial match array variants...")
+    
+    import numpy as np
+    from spatial_enhancement.spatial_calculator import SpatialRelationCalculator
+    
+    calculator = SpatialRelationCalculator()
+    instructions = ["拿起书", "拿起左边的书", "pick up the book on the right",
+                    "the near book in front", "the far book behind"]
+    
+    batch_positions, batch_ids, batch_visible, offsets, batch_instructions, expected = [], [], [], [0], [], []
+    for candidates in _comparison_candidate_lists():
+        positions = np.array([[obj['position']['x'], obj['position']['y'], obj['position']['z']]
+                              for obj in candidates], dtype=float).reshape(-1, 3)
+        object_ids = [obj['objectId'] for obj in candidates]
+        visible = np.array([obj['visible'] for obj in candidates], dtype=bool)
+        
+        for instruction in instructions:
+            scalar = calculator.find_best_spatial_match(candidates, instruction)
+            array = calculator.find_best_spatial_match_arr(positions, object_ids, instruction, visible)
+            assert array == scalar, (instruction, object_ids, array, scalar)
+            
+            batch_positions.append(positions)
+            batch_ids.extend(object_ids)
+            batch_visible.append(visible)
+            offsets.append(offsets[-1] + len(candidates))
+            batch_instructions.append(instruction)
+            expected.append(scalar)
+    
+    batch = calculator.find_best_spatial_match_batch(
+        np.concatenate(batch_positions), offsets, batch_ids, batch_instructions,
+        np.concatenate(batch_visible)
+    )
+    assert batch == expected
+    print(f"✓ Array and batch matches agree on {len(expected)} cases")
+    return True
+
+def test_heuristic_selection_batch():
+    """heuristic_object_selection_batch must agree with heuristic_object_selection."""
+    print("\nTesting heuristic selection batch...")
+    
+    from spatial_enhancement.heuristic_detector import HeuristicAmbiguityDetector
+    from spatial_enhancement.spatial_calculator import SpatialRelationCalculator
+    
+    instructions, candidates_list = [], []
+    for candidates in _comparison_candidate_lists():
+        for instruction in ["拿起书", "拿起左边的书", "the far book"]:
+            instructions.append(instruction)
+            candidates_list.append(candidates)
+    
+    for detector in (HeuristicAmbiguityDetector(SpatialRelationCalculator()),
+                     HeuristicAmbiguityDetector()):
+        batch = detector.heuristic_object_selection_batch(instructions, candidates_list)
+        assert len(batch) == len(instructions)
+        for instruction, candidates, result in zip(instructions, candidates_list, batch):
+            scalar = detector.heuristic_object_selection(instruction, candidates)
+            assert vars(result) == vars(scalar), (instruction, candidates, result, scalar)
+        assert detector.heuristic_object_selection_batch([], []) == []
+    
+    try:
+        detector.heuristic_object_selection_batch(["拿起书"], [])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("mismatched batch lengths must raise ValueError")
+    
+    print(f"✓ Batch selection agrees on {len(instructions)} cases")
+    return True
+
 def test_enhanced_agent_compatibility():
     """Test that EnhancedRocAgent can be created without errors."""
     print("\nTesting EnhancedRocAgent compatibility...")
@@ -236,6 +325,13 @@ def main():
     if not test_integration_with_test_framework():
         all_passed = False
     
+    # Test array and batch variants against the scalar paths
+    if not test_spatial_match_array_variants():
+        all_passed = False
+    
+    if not test_heuristic_selection_batch():
+        all_passed = False
+    
     # Test enhanced agent compatibility
     if not test_enhanced_agent_compatibility():
         all_passed = False
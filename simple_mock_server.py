@@ -1,16 +1,46 @@
 #!/usr/bin/env python3
+import argparse
+import importlib.util
 import json
-from flask import Flask, request, jsonify
+import os
+import shutil
+from flask import Flask, jsonify
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.responses import Response as ASGIResponse
+    from starlette.routing import Route
+except ImportError:
+    uvicorn = None
+    Starlette = None
 
 app = Flask(__name__)
 
+# The reply never depends on the request, so it is serialized once
+CHAT_RESPONSE = {
+    "output_text": "navigate to object",
+    "output_len": 18
+}
+if orjson is not None:
+    CHAT_RESPONSE_BODY = orjson.dumps(CHAT_RESPONSE)
+else:
+    CHAT_RESPONSE_BODY = json.dumps(CHAT_RESPONSE).encode('utf-8')
+
+# Response objects are plain WSGI callables; this one is never mutated,
+# so it is shared by every request
+_CHAT_RESPONSE = app.response_class(CHAT_RESPONSE_BODY, mimetype='application/json')
+
 @app.route("/chat", methods=["POST"])
 def chat():
-    data = request.json
-    return jsonify({
-        "output_text": "navigate to object",
-        "output_len": 18
-    })
+    # The (possibly image-laden) request body is not decoded: nothing in
+    # it affects the reply
+    return _CHAT_RESPONSE
 
 @app.route("/generate", methods=["POST"])
 def generate():
@@ -20,5 +50,46 @@ def generate():
 def health():
     return jsonify({"status": "healthy"})
 
+def create_asgi_app():
+    """ASGI twin of ``app`` with the same routes and replies."""
+    async def asgi_chat(request):
+        return ASGIResponse(CHAT_RESPONSE_BODY, media_type='application/json')
+    
+    async def asgi_health(request):
+        return ASGIResponse(b'{"status":"healthy"}', media_type='application/json')
+    
+    return Starlette(routes=[
+        Route("/chat", asgi_chat, methods=["POST"]),
+        Route("/generate", asgi_chat, methods=["POST"]),
+        Route("/health", asgi_health, methods=["GET"]),
+    ])
+
+def serve(host='127.0.0.1', port=10000, workers=8, use_flask=False):
+    """Serve the mock VLM with the fastest stack available.
+    
+    Prefers Starlette on uvicorn, which skips building a WSGI environ per
+    request. Otherwise runs the Flask app under gunicorn's gevent workers,
+    preloaded so the serialized reply is built once in the master and
+    shared copy-on-write by the forked workers. Falls back to Werkzeug's
+    threaded dev server. ``use_flask`` skips the ASGI stack.
+    """
+    if uvicorn is not None and not use_flask:
+        uvicorn.run(create_asgi_app(), host=host, port=port, log_level='warning')
+        return
+    
+    gunicorn = shutil.which("gunicorn")
+    if gunicorn and importlib.util.find_spec("gevent") is not None:
+        os.execvp(gunicorn, [
+            gunicorn, "-k", "gevent", "-w", str(workers), "--preload",
+            "-b", f"{host}:{port}",
+            "--chdir", os.path.dirname(os.path.abspath(__file__)),
+            "simple_mock_server:app",
+        ])
+    app.run(host=host, port=port, debug=False, threaded=True)
+
 if __name__ == "__main__":
-    app.run(host='127.0.0.1', port=10000, debug=False)
+    parser = argparse.ArgumentParser(description="Mock VLM server")
+    parser.add_argument("--flask", action="store_true",
+                        help="serve the Flask app even when uvicorn/starlette are installed")
+    args = parser.parse_args()
+    serve(use_flask=args.flask)
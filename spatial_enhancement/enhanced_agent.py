@@ -1,13 +1,12 @@
 """EnhancedRocAgent that integrates spatial reasoning capabilities."""
 
-import sys
-import os
 import math
+from functools import cached_property
+import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
 
-# Add paths for imports
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
+# The project root is already importable wherever this package is, so the
+# sibling evaluate package resolves without touching sys.path
 try:
     from evaluate.ai2thor_engine.RocAgent import RocAgent
     from evaluate.ai2thor_engine.baseAgent import BaseAgent
@@ -24,9 +23,38 @@ except ImportError:
             pass
 
 from .spatial_calculator import SpatialRelationCalculator
-from .heuristic_detector import HeuristicAmbiguityDetector, AmbiguityResult
-from .geometric_analyzer import GeometricAnalyzer, ObservationStrategy
-from .vlm_response_parser import VLMResponseParser, EnhancedAmbiguityResolver
+
+# Built on first use; only needed once a navigation is actually ambiguous
+_LAZY_ATTRS = ('ambiguity_detector', 'vlm_response_parser', 'enhanced_ambiguity_resolver')
+
+_RAD2DEG = 180.0 / math.pi
+
+
+
+class _Stats:
+    """Enhancement usage counters."""
+    
+    __slots__ = ('ambiguity_resolutions', 'spatial_calculations',
+                 'geometric_optimizations', 'fallback_uses')
+    
+    def __init__(self):
+        self.ambiguity_resolutions = 0
+        self.spatial_calculations = 0
+        self.geometric_optimizations = 0
+        self.fallback_uses = 0
+    
+    def as_dict(self) -> Dict[str, int]:
+        """Get the counters as a dictionary."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _candidate_positions(candidates: List[Dict[str, Any]]) -> np.ndarray:
+    """Stack candidate x, y, z positions into an (N, 3) float array."""
+    return np.array(
+        [(pos.get('x', 0), pos.get('y', 0), pos.get('z', 0))
+         for pos in (obj.get('position', {}) for obj in candidates)],
+        dtype=np.float64
+    ).reshape(-1, 3)
 
 class EnhancedRocAgent(RocAgent):
     """Enhanced RocAgent with advanced spatial reasoning capabilities."""
@@ -58,21 +86,44 @@ class EnhancedRocAgent(RocAgent):
         
         # Enhancement control
         self.enable_enhancements = enable_enhancements
-        self.enhancement_stats = {
-            'ambiguity_resolutions': 0,
-            'spatial_calculations': 0,
-            'geometric_optimizations': 0,
-            'fallback_uses': 0
-        }
+        self.enhancement_stats = _Stats()
+        
+        # Candidate lists per itemtype, valid for a single event
+        self._candidates_cache: Dict[str, List[Dict[str, Any]]] = {}
+        self._candidates_by_id_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._candidate_arrays_cache: Dict[str, Tuple[List[str], np.ndarray, np.ndarray]] = {}
+        self._candidates_cache_event = None
+        
+        # (event, container, value) of the last legal navigation/interaction walk
+        self._legal_navigations_cache = (None, None, None)
+        self._legal_interactions_cache = (None, None, None)
+        
+        # (event, agent position) of the last VLM reference resolution
+        self._agent_pos_cache = (None, None)
+        
+        # Set once the geometric analyzer has been constructed
+        self._has_geom = False
+        
+        self._init_enhancement_modules()
+    
+    def _init_enhancement_modules(self):
+        """Create the spatial enhancement modules if enhancements are enabled.
         
+        Kept separate from __init__ so subclasses can (re)build the modules
+        without re-entering RocAgent's scene initialization.
+        """
         if self.enable_enhancements:
             # Initialize enhancement modules
             try:
                 self.spatial_calculator = SpatialRelationCalculator(self.eventobject)
-                self.ambiguity_detector = HeuristicAmbiguityDetector(self.spatial_calculator)
+                # Import every module now so a broken one disables enhancements here;
+                # the detector, parser and resolver are still built on first use
+                from . import heuristic_detector, vlm_response_parser
+                from .geometric_analyzer import GeometricAnalyzer
+                for attr in _LAZY_ATTRS:
+                    self.__dict__.pop(attr, None)
                 self.geometric_analyzer = GeometricAnalyzer()
-                self.vlm_response_parser = VLMResponseParser()
-                self.enhanced_ambiguity_resolver = EnhancedAmbiguityResolver(self.vlm_response_parser)
+                self._has_geom = True
                 self.enhancements_available = True
                 print("[Spatial Enhancement] Spatial enhancement modules loaded successfully")
             except Exception as e:
@@ -82,6 +133,29 @@ class EnhancedRocAgent(RocAgent):
         else:
             self.enhancements_available = False
     
+    @cached_property
+    def ambiguity_detector(self):
+        """Heuristic ambiguity detector, built on first use."""
+        from .heuristic_detector import HeuristicAmbiguityDetector
+        return HeuristicAmbiguityDetector(self.spatial_calculator)
+    
+    @cached_property
+    def vlm_response_parser(self):
+        """VLM response parser, built on first use."""
+        from .vlm_response_parser import VLMResponseParser
+        return VLMResponseParser()
+    
+    @cached_property
+    def enhanced_ambiguity_resolver(self):
+        """Resolver for numbered VLM object references, built on first use."""
+        from .vlm_response_parser import EnhancedAmbiguityResolver
+        return EnhancedAmbiguityResolver(self.vlm_response_parser)
+    
+    @cached_property
+    def _teleport(self):
+        """Teleport action of the agent's action set, looked up once."""
+        return self.action.action_mapping["teleport"]
+    
     def navigate(self, itemtype: str, itemname: Optional[str] = None) -> Tuple[Any, Any, Any]:
         """Enhanced navigation with ambiguity resolution.
         
@@ -92,54 +166,104 @@ class EnhancedRocAgent(RocAgent):
         Returns:
             Tuple of (image_fp, legal_navigations, legal_interactions)
         """
-        if not self.enable_enhancements or not self.enhancements_available:   # Use original navigation
+        if not (self.enable_enhancements and self.enhancements_available):   # Use original navigation
             return super().navigate(itemtype)
         
         try:
-            # Get candidate objects of the specified type
-            candidates = self._get_candidate_objects(itemtype)
-            
-            if len(candidates) <= 1: # which means there's no ambiguity, just use the original method
-                return super().navigate(itemtype)
-            
-            # enhanced disambiguation
-            self.enhancement_stats['ambiguity_resolutions'] += 1
-            
-            # Use itemname if provided, otherwise use itemtype
-            instruction = itemname if itemname else f"navigate to {itemtype}"  # Futher TODO: add more instructions
-            
-            # Detect and resolve ambiguity
-            ambiguity_result = self.ambiguity_detector.detect_ambiguity(instruction, candidates)
+            selected_object = self._select_candidate(itemtype, itemname)
+            if selected_object:
+                return self._navigate_to_specific_object(selected_object, itemtype)
+        except Exception as e:
+            print(f"[Spatial Enhancement] Enhancement navigation failed: {e}")
+            self.enhancement_stats.fallback_uses += 1 # increase the negative metric that measures the effectiveness of the enhancement
+            return super().navigate(itemtype)
+        
+        # No ambiguity or no resolution, only rely on the original, first-order method
+        return super().navigate(itemtype)
+    
+    def _select_candidate(self, itemtype: str, itemname: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Pick the object to navigate to among ambiguous candidates.
+        
+        Args:
+            itemtype: Type of object to navigate to
+            itemname: Optional specific name/description
             
-            if ambiguity_result.selected_object_id and ambiguity_result.confidence > 0.5:
-                selected_object = next(
-                    (obj for obj in candidates if obj.get('objectId') == ambiguity_result.selected_object_id),
-                    None
-                )
-                
-                if selected_object:
-                    return self._navigate_to_specific_object(selected_object, itemtype)
+        Returns:
+            Selected candidate, or None to use the original navigation
+        """
+        # Cheap upper bound first: a single candidate needs no dedup or lookups
+        if self._candidate_count(itemtype) <= 1:
+            return None
+        
+        # Get candidate objects of the specified type
+        candidates = self._get_candidate_objects(itemtype)
+        
+        if len(candidates) <= 1: # which means there's no ambiguity, just use the original method
+            return None
+        
+        # enhanced disambiguation
+        self.enhancement_stats.ambiguity_resolutions += 1
+        
+        # Use itemname if provided, otherwise use itemtype
+        instruction = itemname if itemname else f"navigate to {itemtype}"  # Futher TODO: add more instructions
+        
+        # Detect and resolve ambiguity
+        object_ids, positions, visible_mask = self._get_candidate_arrays(itemtype)
+        ambiguity_result = self.ambiguity_detector.detect_ambiguity(
+            instruction, candidates, object_ids, positions, visible_mask
+        )
+        
+        if ambiguity_result.selected_object_id and ambiguity_result.confidence > 0.5:
+            selected_object = self._get_candidates_by_id(itemtype).get(ambiguity_result.selected_object_id)
             
-            self.enhancement_stats['fallback_uses'] += 1
-            if ambiguity_result.clarification_question:
-                print(f"[Spatial Enhancement] Ambiguity detected: {ambiguity_result.clarification_question}")
-                # use the closest object as fallback
-                relations = self.spatial_calculator.calculate_relative_positions(candidates)
-                closest_obj_id = min(relations.items(), key=lambda x: x[1].distance_to_agent)[0]
-                selected_object = next(
-                    (obj for obj in candidates if obj.get('objectId') == closest_obj_id),
-                    None
-                )
-                if selected_object:
-                    return self._navigate_to_specific_object(selected_object, itemtype)
+            if selected_object:
+                return selected_object
+        
+        self.enhancement_stats.fallback_uses += 1
+        if ambiguity_result.clarification_question:
+            print(f"[Spatial Enhancement] Ambiguity detected: {ambiguity_result.clarification_question}")
+            # use the closest object as fallback
+            return self._closest_candidate(candidates, positions)
+        
+        return None
+    
+    def _closest_candidate(self, candidates: List[Dict[str, Any]],
+                           positions: Optional[np.ndarray] = None) -> Optional[Dict[str, Any]]:
+        """Get the candidate closest to the agent.
+        
+        Uses the spatial calculator's agent position, like the detector that
+        ranked the candidates, and its ground-plane (x, z) distance, but as a
+        single squared-distance argmin instead of building full spatial
+        relations for every candidate.
+        
+        Args:
+            candidates: Candidate objects
+            positions: Optional precomputed (N, 3) candidate positions
             
-            # Final fallback, only rely on the original, first-order method
-            return super().navigate(itemtype)
+        Returns:
+            Closest candidate object, or None if there are no candidates
+        """
+        if not candidates:
+            return None
+        
+        agent_position = self.spatial_calculator.get_agent_position()
+        if positions is None:
+            positions = _candidate_positions(candidates)
+        offsets = positions[:, ::2] - (agent_position.get('x', 0), agent_position.get('z', 0))
+        d2 = np.einsum('ij,ij->i', offsets, offsets)
+        return candidates[int(d2.argmin())]
+    
+    def _candidate_count(self, itemtype: str) -> int:
+        """Get an upper bound on the number of candidate objects of a type.
+        
+        Args:
+            itemtype: Object type to search for
             
-        except Exception as e:
-            print(f"[Spatial Enhancement] Enhancement navigation failed: {e}")
-            self.enhancement_stats['fallback_uses'] += 1 # increase the negative metric that measures the effectiveness of the enhancement
-            return super().navigate(itemtype)
+        Returns:
+            Number of target ids plus objects of the type, before deduplication
+        """
+        return (len(self.target_item_type2obj_id.get(itemtype, ())) +
+                len(self.objecttype2object.get(itemtype, ())))
     
     def _get_candidate_objects(self, itemtype: str) -> List[Dict[str, Any]]:
         """Get all objects of the specified type.
@@ -148,35 +272,78 @@ class EnhancedRocAgent(RocAgent):
             itemtype: Object type to search for
             
         Returns:
-            List of candidate objects
+            List of candidate objects (shared per event; do not mutate)
         """
-        candidates = []
+        # Candidates only change with the scene, so reuse them within an event
+        event = self.controller.last_event
+        if event is not self._candidates_cache_event:
+            self._candidates_cache.clear()
+            self._candidates_by_id_cache.clear()
+            self._candidate_arrays_cache.clear()
+            self._candidates_cache_event = event
+        cached = self._candidates_cache.get(itemtype)
+        if cached is not None:
+            return cached
+        
+        # Single pass; the first object seen for an objectId wins
+        candidates_by_id = {}
         
         # Check target objects first
-        if itemtype in self.target_item_type2obj_id:
-            for obj_id in self.target_item_type2obj_id[itemtype]:
-                try:
-                    obj = self.eventobject.get_object_by_id(self.controller.last_event, obj_id)
-                    if obj:
-                        candidates.append(obj)
-                except:
-                    pass
+        for obj_id in self.target_item_type2obj_id.get(itemtype, ()):
+            try:
+                obj = self.eventobject.get_object_by_id(event, obj_id)
+                if obj and obj.get('objectId'):
+                    candidates_by_id.setdefault(obj['objectId'], obj)
+            except:
+                pass
         
         # Also, the general object types
-        if itemtype in self.objecttype2object:
-            candidates.extend(self.objecttype2object[itemtype])
-        
-        # Remove duplicates based on objectId
-        unique_candidates = []
-        seen_ids = set()
-        for obj in candidates:
+        for obj in self.objecttype2object.get(itemtype, ()):
             obj_id = obj.get('objectId')
-            if obj_id and obj_id not in seen_ids:
-                unique_candidates.append(obj)
-                seen_ids.add(obj_id)
+            if obj_id:
+                candidates_by_id.setdefault(obj_id, obj)
         
+        unique_candidates = list(candidates_by_id.values())
+        self._candidates_cache[itemtype] = unique_candidates
+        self._candidates_by_id_cache[itemtype] = candidates_by_id
         return unique_candidates
     
+    def _get_candidates_by_id(self, itemtype: str) -> Dict[str, Dict[str, Any]]:
+        """Get the candidate objects of a type keyed by objectId.
+        
+        Args:
+            itemtype: Object type to search for
+            
+        Returns:
+            Dictionary mapping objectId to candidate object
+        """
+        self._get_candidate_objects(itemtype)
+        return self._candidates_by_id_cache[itemtype]
+    
+    def _get_candidate_arrays(self, itemtype: str) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """Get candidate ids, positions and visibility of a type as arrays.
+        
+        Extracted once per event so the detector and the closest-candidate
+        fallback share them instead of each walking the candidate dicts.
+        
+        Args:
+            itemtype: Object type to search for
+            
+        Returns:
+            Tuple of (object_ids, (N, 3) positions, (N,) visible mask)
+        """
+        candidates = self._get_candidate_objects(itemtype)
+        arrays = self._candidate_arrays_cache.get(itemtype)
+        if arrays is None:
+            arrays = (
+                [obj['objectId'] for obj in candidates],
+                _candidate_positions(candidates),
+                np.fromiter((obj.get('visible', True) for obj in candidates),
+                            dtype=bool, count=len(candidates))
+            )
+            self._candidate_arrays_cache[itemtype] = arrays
+        return arrays
+    
     def _navigate_to_specific_object(self, target_object: Dict[str, Any], 
                                    itemtype: str) -> Tuple[Any, Any, Any]:
         """Navigate to a specific object using enhanced positioning.
@@ -188,23 +355,21 @@ class EnhancedRocAgent(RocAgent):
         Returns:
             Tuple of (image_fp, legal_navigations, legal_interactions)
         """
-        try:
-            # Use geometric analyzer for better positioning
-            if hasattr(self, 'geometric_analyzer'):
-                self.enhancement_stats['geometric_optimizations'] += 1
-                
-                # Get enhanced positioning strategy
-                positions = self._compute_enhanced_position(target_object)
-                
-                if positions:
-                    return self._execute_navigation_to_position(target_object, positions[0], itemtype)
+        # Use geometric analyzer for better positioning
+        if self._has_geom:
+            self.enhancement_stats.geometric_optimizations += 1
             
-            # Fallback to original positioning
-            return self._execute_original_navigation(target_object, itemtype)
+            # Get enhanced positioning strategy
+            positions = self._compute_enhanced_position(target_object)
             
-        except Exception as e:
-            print(f"[Spatial Enhancement] Enhanced positioning failed: {e}")
-            return self._execute_original_navigation(target_object, itemtype)
+            if positions:
+                try:
+                    return self._execute_navigation_to_position(target_object, positions[0], itemtype)
+                except Exception as e:
+                    print(f"[Spatial Enhancement] Enhanced positioning failed: {e}")
+        
+        # Fallback to original positioning
+        return self._execute_original_navigation(target_object, itemtype)
     
     def _compute_enhanced_position(self, target_object: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Compute enhanced positions using geometric analysis.
@@ -254,15 +419,13 @@ class EnhancedRocAgent(RocAgent):
         dz = obj_pos.get('z', 0) - position.get('z', 0)
         
         # Calculate angle to face object
-        angle = math.degrees(math.atan2(dx, dz))
-        if angle < 0:
-            angle += 360
+        angle = (math.atan2(dx, dz) * _RAD2DEG) % 360.0
         
         target_rotation = {'x': 0, 'y': angle, 'z': 0}
         horizon = 60  # Default horizon
         
         # Teleport to position
-        event = self.action.action_mapping["teleport"](
+        event = self._teleport(
             self.controller, 
             position=position, 
             rotation=target_rotation, 
@@ -304,19 +467,53 @@ class EnhancedRocAgent(RocAgent):
         Returns:
             Tuple of (image_fp, legal_navigations, legal_interactions)
         """
-        # Temporarily modify target_item_type2obj_id to point to specific object
-        original_mapping = self.target_item_type2obj_id.get(itemtype, [])
-        self.target_item_type2obj_id[itemtype] = [target_object.get('objectId')]
+        mapping = self.target_item_type2obj_id
+        target_ids = [target_object.get('objectId')]
+        original_mapping = mapping.get(itemtype, [])
+        if original_mapping == target_ids:
+            # Already points at the object, nothing to patch or restore
+            return super().navigate(itemtype)
         
+        # Temporarily modify target_item_type2obj_id to point to specific object
+        mapping[itemtype] = target_ids
         try:
-            result = super().navigate(itemtype)
-            return result
+            return super().navigate(itemtype)
         finally:
             # Restore original mapping
             if original_mapping:
-                self.target_item_type2obj_id[itemtype] = original_mapping
-            elif itemtype in self.target_item_type2obj_id:
-                del self.target_item_type2obj_id[itemtype]
+                mapping[itemtype] = original_mapping
+            else:
+                del mapping[itemtype]
+    
+    def get_legal_navigations(self):
+        """Get navigable object types, reusing the result for an unchanged event.
+        
+        Returns:
+            List of navigable object types
+        """
+        event = self.controller.last_event
+        cached_event, _, value = self._legal_navigations_cache
+        if value is None or cached_event is not event:
+            value = super().get_legal_navigations()
+            self._legal_navigations_cache = (event, None, value)
+        return list(value)
+    
+    def get_legal_interactions(self):
+        """Get interactable object types, reusing the result for an unchanged event.
+        
+        The result also depends on the currently opened container, so it is
+        part of the cache key.
+        
+        Returns:
+            List of interactable object types
+        """
+        event = self.controller.last_event
+        container = self.current_container
+        cached_event, cached_container, value = self._legal_interactions_cache
+        if value is None or cached_event is not event or cached_container is not container:
+            value = super().get_legal_interactions()
+            self._legal_interactions_cache = (event, container, value)
+        return list(value)
     
     def get_enhancement_stats(self) -> Dict[str, Any]:
         """Get statistics about enhancement usage.
@@ -327,7 +524,7 @@ class EnhancedRocAgent(RocAgent):
         return {
             'enhancements_enabled': self.enable_enhancements,
             'enhancements_available': self.enhancements_available,
-            'stats': self.enhancement_stats.copy()
+            'stats': self.enhancement_stats.as_dict()
         }
     
     def toggle_enhancements(self, enabled: bool):
@@ -345,12 +542,7 @@ class EnhancedRocAgent(RocAgent):
     
     def reset_enhancement_stats(self):
         """Reset enhancement usage statistics."""
-        self.enhancement_stats = {
-            'ambiguity_resolutions': 0,
-            'spatial_calculations': 0,
-            'geometric_optimizations': 0,
-            'fallback_uses': 0
-        }
+        self.enhancement_stats = _Stats()
     
     def resolve_vlm_response(self, vlm_response: str, candidate_objects: List[Dict[str, Any]], 
                            instruction: str = "") -> Optional[Dict[str, Any]]:
@@ -364,31 +556,43 @@ class EnhancedRocAgent(RocAgent):
         Returns:
             Selected object or None if resolution fails
         """
-        if not self.enable_enhancements or not self.enhancements_available:
+        if not (self.enable_enhancements and self.enhancements_available):
             return None
         
         try:
             # Get agent position for spatial reasoning
-            agent_position = None
-            if hasattr(self, 'controller') and self.controller:
-                event = self.controller.last_event
-                if event and event.metadata:
-                    agent_position = event.metadata.get('agent', {}).get('position', {})
+            agent_position = self._get_event_agent_position()
             
             # Use enhanced ambiguity resolver
             result = self.enhanced_ambiguity_resolver.resolve_object_reference(
                 instruction, candidate_objects, vlm_response, agent_position
             )
-            
-            if result.get('selected_object_id'):
-                print(f"[Spatial Enhancement] VLM response resolved: {result['method']} - {result['reasoning']}")
-                return result.get('selected_object')
-            
-            return None
-            
         except Exception as e:
             print(f"[Spatial Enhancement] VLM response resolution failed: {e}")
             return None
+        
+        if result.get('selected_object_id'):
+            print(f"[Spatial Enhancement] VLM response resolved: {result['method']} - {result['reasoning']}")
+            return result.get('selected_object')
+        
+        return None
+    
+    def _get_event_agent_position(self) -> Optional[Dict[str, float]]:
+        """Get the agent position of the current event, read once per event.
+        
+        Returns:
+            Agent position dictionary, or None without a usable event
+        """
+        if not (hasattr(self, 'controller') and self.controller):
+            return None
+        event = self.controller.last_event
+        cached_event, agent_position = self._agent_pos_cache
+        if cached_event is not event:
+            agent_position = None
+            if event and event.metadata:
+                agent_position = event.metadata.get('agent', {}).get('position', {})
+            self._agent_pos_cache = (event, agent_position)
+        return agent_position
     
     def navigate_with_vlm_response(self, itemtype: str, vlm_response: str, 
                                  instruction: str = "") -> Tuple[Any, Any, Any]:
@@ -402,28 +606,28 @@ class EnhancedRocAgent(RocAgent):
         Returns:
             Tuple of (image_fp, legal_navigations, legal_interactions)
         """
-        if not self.enable_enhancements or not self.enhancements_available:
+        if not (self.enable_enhancements and self.enhancements_available):
+            return super().navigate(itemtype)
+        
+        if self._candidate_count(itemtype) <= 1:
             return super().navigate(itemtype)
         
         try:
             # Get candidate objects
             candidates = self._get_candidate_objects(itemtype)
-            
-            if len(candidates) <= 1:
-                return super().navigate(itemtype)
-            
+        except Exception as e:
+            print(f"[Spatial Enhancement] VLM navigation failed: {e}")
+            return super().navigate(itemtype)
+        
+        if len(candidates) > 1:
             # Try to resolve VLM response
             selected_object = self.resolve_vlm_response(vlm_response, candidates, instruction)
             
             if selected_object:
                 return self._navigate_to_specific_object(selected_object, itemtype)
-            
-            # Fallback to original navigation
-            return super().navigate(itemtype)
-            
-        except Exception as e:
-            print(f"[Spatial Enhancement] VLM navigation failed: {e}")
-            return super().navigate(itemtype)
+        
+        # Fallback to original navigation
+        return super().navigate(itemtype)
 
 # Compatibility wrapper for easy replacement
 class LightweightEnhancementAdapter:
@@ -1,6 +1,7 @@
 """HeuristicAmbiguityDetector for detecting and resolving object ambiguity using heuristic rules."""
 
 import re
+import numpy as np
 from typing import Dict, List, Any, Tuple, Optional
 from dataclasses import dataclass
 from .spatial_calculator import SpatialRelationCalculator
@@ -52,6 +53,11 @@ class HeuristicAmbiguityDetector:
                 r'(抽屉|drawer).*?(里|in)'
             ]
         }
+        # Compiled once; IGNORECASE lets us scan the raw instruction without lower()
+        self._compiled_patterns = {
+            pattern_type: [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+            for pattern_type, patterns in self.spatial_patterns.items()
+        }
         
         # Object type synonyms for better matching
         self.object_synonyms = {
@@ -64,12 +70,19 @@ class HeuristicAmbiguityDetector:
             'plate': ['盘子', '盘', 'plate', 'dish']
         }
     
-    def detect_ambiguity(self, instruction: str, candidate_objects: List[Dict[str, Any]]) -> AmbiguityResult:
+    def detect_ambiguity(self, instruction: str, candidate_objects: List[Dict[str, Any]],
+                         object_ids: Optional[List[str]] = None,
+                         positions: Optional[np.ndarray] = None,
+                         visible_mask: Optional[np.ndarray] = None) -> AmbiguityResult:
         """Detect if instruction contains ambiguous object references.
         
         Args:
             instruction: Natural language instruction
             candidate_objects: List of objects with same type
+            object_ids: Optional precomputed ids aligned with candidate_objects
+            positions: Optional precomputed (N, 3) candidate positions; with
+                object_ids, spatial matching runs on the arrays
+            visible_mask: Optional (N,) boolean visibility array
             
         Returns:
             AmbiguityResult with detection outcome
@@ -86,9 +99,14 @@ class HeuristicAmbiguityDetector:
         if spatial_keywords:
             # Has spatial constraints, try to resolve
             if self.spatial_calculator:
-                best_match, confidence = self.spatial_calculator.find_best_spatial_match(
-                    candidate_objects, instruction
-                )
+                if positions is not None and object_ids is not None:
+                    best_match, confidence = self.spatial_calculator.find_best_spatial_match_arr(
+                        positions, object_ids, instruction, visible_mask
+                    )
+                else:
+                    best_match, confidence = self.spatial_calculator.find_best_spatial_match(
+                        candidate_objects, instruction
+                    )
                 
                 if confidence > 0.7:
                     return AmbiguityResult(
@@ -141,14 +159,17 @@ class HeuristicAmbiguityDetector:
             Dictionary with spatial pattern types and matched keywords
         """
         found_patterns = {}
-        instruction_lower = instruction.lower()
         
-        for pattern_type, patterns in self.spatial_patterns.items():
+        for pattern_type, patterns in self._compiled_patterns.items():
             matches = []
             for pattern in patterns:
-                found = re.findall(pattern, instruction_lower, re.IGNORECASE)
+                found = pattern.findall(instruction)
                 if found:
-                    matches.extend(found)
+                    # Only the (short) matches are normalised, not the whole instruction
+                    matches.extend(
+                        m.lower() if isinstance(m, str) else tuple(g.lower() for g in m)
+                        for m in found
+                    )
             
             if matches:
                 found_patterns[pattern_type] = matches
@@ -166,6 +187,92 @@ class HeuristicAmbiguityDetector:
         Returns:
             AmbiguityResult with selection outcome
         """
+        result = self._select_by_rules(instruction, candidate_objects)
+        if result is not None:
+            return result
+        
+        # Rule 3: Prefer closest object to agent
+        relations = self.spatial_calculator.calculate_relative_positions(candidate_objects)
+        closest_obj = min(relations.items(), key=lambda x: x[1].distance_to_agent)
+        return self._closest_object_result(candidate_objects, closest_obj[0])
+    
+    def heuristic_object_selection_batch(self, instructions: List[str],
+                                         candidates_list: List[List[Dict[str, Any]]]) -> List[AmbiguityResult]:
+        """Select objects for several (instruction, candidates) pairs at once.
+        
+        Entries left to the closest-object rule get their distances in a
+        single vectorised pass over the whole batch instead of once per call.
+        
+        Args:
+            instructions: Natural language instructions
+            candidates_list: Candidate objects for each instruction
+            
+        Returns:
+            One AmbiguityResult per instruction, in input order
+        """
+        if len(instructions) != len(candidates_list):
+            raise ValueError("instructions and candidates_list must have the same length")
+        
+        results = [
+            self._select_by_rules(instruction, candidate_objects)
+            for instruction, candidate_objects in zip(instructions, candidates_list)
+        ]
+        
+        # Rule 3: Prefer closest object to agent
+        pending = [k for k, result in enumerate(results) if result is None]
+        if pending:
+            closest_ids = self._closest_object_ids(
+                [candidates_list[k] for k in pending],
+                self.spatial_calculator.get_agent_position()
+            )
+            for k, closest_id in zip(pending, closest_ids):
+                results[k] = self._closest_object_result(candidates_list[k], closest_id)
+        return results
+    
+    def _closest_object_ids(self, candidates_list: List[List[Dict[str, Any]]],
+                            agent_position: Dict[str, float]) -> List[Optional[str]]:
+        """Find the candidate closest to the agent for each entry of a batch.
+        
+        Args:
+            candidates_list: Candidate objects for each batch entry
+            agent_position: Agent position to measure distances from
+            
+        Returns:
+            Closest object id per entry (None for empty entries)
+        """
+        # One (sum_K, 2) array for the whole batch, split back by offsets
+        positions = np.array([
+            (obj.get('position', {}).get('x', 0), obj.get('position', {}).get('z', 0))
+            for candidate_objects in candidates_list
+            for obj in candidate_objects
+        ], dtype=float).reshape(-1, 2)
+        dx = positions[:, 0] - agent_position.get('x', 0)
+        dz = positions[:, 1] - agent_position.get('z', 0)
+        # Same operations as SpatialRelationCalculator._calculate_distance
+        distances = np.sqrt(dx ** 2 + dz ** 2)
+        offsets = np.cumsum([len(candidate_objects) for candidate_objects in candidates_list])[:-1]
+        
+        closest_ids = []
+        for candidate_objects, chunk in zip(candidates_list, np.split(distances, offsets)):
+            if not candidate_objects:
+                closest_ids.append(None)
+                continue
+            closest = candidate_objects[int(chunk.argmin())]
+            closest_ids.append(closest.get('objectId', closest.get('name', 'unknown')))
+        return closest_ids
+    
+    def _select_by_rules(self, instruction: str,
+                         candidate_objects: List[Dict[str, Any]]) -> Optional[AmbiguityResult]:
+        """Apply every selection rule except the closest-object one.
+        
+        Args:
+            instruction: Natural language instruction
+            candidate_objects: List of candidate objects
+            
+        Returns:
+            AmbiguityResult with selection outcome, or None when Rule 3
+            (closest object to the agent) has to decide
+        """
         if not candidate_objects:
             return AmbiguityResult(
                 has_ambiguity=False,
@@ -205,18 +312,9 @@ class HeuristicAmbiguityDetector:
                         confidence=confidence
                     )
         
-        # Rule 3: Prefer closest object to agent
+        # Rule 3 (closest object) is left to the callers, which only then compute distances
         if self.spatial_calculator:
-            relations = self.spatial_calculator.calculate_relative_positions(candidate_objects)
-            closest_obj = min(relations.items(), key=lambda x: x[1].distance_to_agent)
-            
-            return AmbiguityResult(
-                has_ambiguity=True,
-                reason="Multiple candidates, selected closest",
-                selected_object_id=closest_obj[0],
-                confidence=0.4,
-                clarification_question=self._generate_simple_clarification(candidate_objects)
-            )
+            return None
         
         # Rule 4: Default to first object (fallback)
         return AmbiguityResult(
@@ -227,6 +325,17 @@ class HeuristicAmbiguityDetector:
             clarification_question=self._generate_simple_clarification(candidate_objects)
         )
     
+    def _closest_object_result(self, candidate_objects: List[Dict[str, Any]],
+                               closest_object_id: Optional[str]) -> AmbiguityResult:
+        """Build the Rule 3 result for the candidate closest to the agent."""
+        return AmbiguityResult(
+            has_ambiguity=True,
+            reason="Multiple candidates, selected closest",
+            selected_object_id=closest_object_id,
+            confidence=0.4,
+            clarification_question=self._generate_simple_clarification(candidate_objects)
+        )
+    
     def _generate_clarification_question(self, candidates: List[Dict[str, Any]], 
                                        spatial_keywords: Dict[str, List[str]]) -> str:
         """Generate a clarification question based on spatial context.
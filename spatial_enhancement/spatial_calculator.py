@@ -1,21 +1,27 @@
 """SpatialRelationCalculator for computing spatial relationships between objects and agent."""
 
+import functools
 import math
 import numpy as np
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
-import sys
-import os
-
-# Add parent directory to path to import spatial_perception
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# spatial_perception sits next to this package under the project root
 try:
     from spatial_perception.basic_signature import SpatialSignature
 except ImportError:
     # Fallback if spatial_perception is not available
     SpatialSignature = None
 
+# Object types treated as scene landmarks for landmark relations
+_LANDMARK_TYPES = frozenset({'Window', 'Door', 'DoorFrame', 'Wall'})
+
+
+@functools.lru_cache(maxsize=128)
+def _lower_instruction(instruction: str) -> str:
+    """Lower-case an instruction once; the same text is scanned several times per turn."""
+    return instruction.lower()
+
 @dataclass
 class SpatialRelation:
     """Represents spatial relationship between objects."""
@@ -60,12 +66,14 @@ class SpatialRelationCalculator:
             Dictionary mapping object_id to SpatialRelation
         """
         if agent_position is None and self.event_object:
-            agent_position = self._get_agent_position()
+            agent_position = self.get_agent_position()
         elif agent_position is None:
             # Default position if no event object
             agent_position = {'x': 0, 'y': 0, 'z': 0}
             
         relations = {}
+        # Filter landmarks once rather than rescanning every object per candidate
+        landmarks = [obj for obj in candidate_objects if obj.get('objectType') in _LANDMARK_TYPES]
         
         for obj in candidate_objects:
             obj_id = obj.get('objectId', obj.get('name', 'unknown'))
@@ -78,7 +86,7 @@ class SpatialRelationCalculator:
             is_visible = obj.get('visible', True)
             
             # Calculate landmark relations
-            landmark_relations = self._calculate_landmark_relations(obj, candidate_objects)
+            landmark_relations = self._calculate_landmark_relations(obj, landmarks)
             
             # Calculate container relations
             container_relations = self._calculate_container_relations(obj)
@@ -97,8 +105,8 @@ class SpatialRelationCalculator:
             
         return relations
     
-    def _get_agent_position(self) -> Dict[str, float]:
-        """Get current agent position from event object."""
+    def get_agent_position(self) -> Dict[str, float]:
+        """Get current agent position from event object (origin without one)."""
         if hasattr(self.event_object, 'controller'):
             agent_meta = self.event_object.controller.last_event.metadata.get('agent', {})
             return agent_meta.get('position', {'x': 0, 'y': 0, 'z': 0})
@@ -153,13 +161,14 @@ class SpatialRelationCalculator:
     def _calculate_landmark_relations(self, obj: Dict[str, Any], 
                                     all_objects: List[Dict[str, Any]]) -> Dict[str, str]:
         """Calculate relations to scene landmarks (windows, doors, etc)."""
-        landmark_types = ['Window', 'Door', 'DoorFrame', 'Wall']
         relations = {}
+        if not all_objects:
+            return relations
         
         obj_pos = obj.get('position', {})
         
         for other_obj in all_objects:
-            if other_obj.get('objectType') in landmark_types:
+            if other_obj.get('objectType') in _LANDMARK_TYPES:
                 other_pos = other_obj.get('position', {})
                 distance = self._calculate_distance(obj_pos, other_pos)
                 
@@ -195,7 +204,7 @@ class SpatialRelationCalculator:
         Returns:
             Dictionary with constraint types as keys and matched keywords as values
         """
-        instruction_lower = instruction.lower()
+        instruction_lower = _lower_instruction(instruction)
         constraints = {}
         
         for direction_type, keywords in self.direction_keywords.items():
@@ -312,4 +321,113 @@ class SpatialRelationCalculator:
                 
             return best_obj_id, confidence
         else:
-            return None, 0.0
\ No newline at end of file
+            return None, 0.0
+            
+    def find_best_spatial_match_arr(self, positions: np.ndarray, object_ids: List[str],
+                                    instruction: str, visible_mask: Optional[np.ndarray] = None,
+                                    agent_position: Optional[Dict[str, float]] = None) -> Tuple[Optional[str], float]:
+        """Array form of find_best_spatial_match for pre-extracted candidate data.
+        
+        Scores every candidate in one vectorised pass instead of building a
+        SpatialRelation per object; selection and confidence follow the dict path.
+        
+        Args:
+            positions: (N, 3) array of candidate x, y, z positions
+            object_ids: Object ids aligned with positions
+            instruction: Natural language instruction with spatial references
+            visible_mask: Optional (N,) boolean visibility array (all visible if None)
+            agent_position: Current agent position (if None, gets from event_object)
+            
+        Returns:
+            Tuple of (best_object_id, confidence_score)
+        """
+        return self.find_best_spatial_match_batch(
+            positions, [0, len(object_ids)], object_ids, [instruction], visible_mask, agent_position
+        )[0]
+        
+    def find_best_spatial_match_batch(self, positions: np.ndarray, offsets: List[int],
+                                      object_ids: List[str], instructions: List[str],
+                                      visible_mask: Optional[np.ndarray] = None,
+                                      agent_position: Optional[Dict[str, float]] = None) -> List[Tuple[Optional[str], float]]:
+        """Find the best spatial match for several instructions at once.
+        
+        Candidates of all instructions are stacked into one array so distances
+        and directions are computed in a single pass for the whole batch.
+        
+        Args:
+            positions: (N, 3) stacked candidate positions for all instructions
+            offsets: len(instructions) + 1 boundaries; candidates of instruction i
+                are rows offsets[i]:offsets[i + 1]
+            object_ids: Object ids aligned with positions
+            instructions: Natural language instructions
+            visible_mask: Optional (N,) boolean visibility array (all visible if None)
+            agent_position: Current agent position (if None, gets from event_object)
+            
+        Returns:
+            List of (best_object_id, confidence_score) per instruction
+        """
+        if agent_position is None and self.event_object:
+            agent_position = self.get_agent_position()
+        elif agent_position is None:
+            agent_position = {'x': 0, 'y': 0, 'z': 0}
+            
+        positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        if visible_mask is None:
+            visible = np.ones(len(object_ids), dtype=bool)
+        else:
+            visible = np.asarray(visible_mask, dtype=bool)
+        
+        dx = positions[:, 0] - agent_position.get('x', 0)
+        dz = positions[:, 2] - agent_position.get('z', 0)
+        distances = np.sqrt(dx ** 2 + dz ** 2)
+        
+        angles = np.degrees(np.arctan2(dx, dz))
+        angles = np.where(angles < 0, angles + 360, angles)
+        directions = np.select(
+            [(angles >= 315) | (angles < 45), angles < 135, angles < 225],
+            ['front', 'right', 'back'],
+            default='left'
+        )
+        
+        matches = []
+        for i, instruction in enumerate(instructions):
+            start, end = offsets[i], offsets[i + 1]
+            if start == end:
+                matches.append((None, 0.0))
+                continue
+            matches.append(self._select_from_arrays(
+                object_ids[start:end], distances[start:end], directions[start:end],
+                visible[start:end], self.extract_spatial_constraints(instruction)
+            ))
+        return matches
+        
+    def _select_from_arrays(self, object_ids: List[str], distances: np.ndarray,
+                            directions: np.ndarray, visible: np.ndarray,
+                            constraints: Dict[str, List[str]]) -> Tuple[Optional[str], float]:
+        """Pick the best candidate of one instruction from its relation arrays."""
+        if not constraints:
+            # No spatial constraints, return closest (preferably visible) object
+            if visible.any():
+                visible_idx = np.flatnonzero(visible)
+                return object_ids[int(visible_idx[np.argmin(distances[visible_idx])])], 0.6
+            return object_ids[int(np.argmin(distances))], 0.3
+        
+        # Same accumulation order as score_spatial_match
+        scores = np.zeros(len(object_ids))
+        for direction_type in constraints:
+            if direction_type in ['left', 'right', 'front', 'back']:
+                scores += directions == direction_type
+            elif direction_type == 'near':
+                scores += np.where(distances < 1.5, 1.0, np.where(distances < 3.0, 0.5, 0.0))
+            elif direction_type == 'far':
+                scores += np.where(distances > 3.0, 1.0, np.where(distances > 1.5, 0.5, 0.0))
+        scores += np.where(visible, 0.1, 0.0)
+        scores = np.minimum(scores / len(constraints), 1.0)
+        
+        # argmax keeps the first of equal scores, like the stable sort in the dict path
+        best = int(np.argmax(scores))
+        confidence = float(scores[best])
+        if visible[best]:
+            confidence = min(confidence + 0.1, 1.0)
+            
+        return object_ids[best], confidence
\ No newline at end of file
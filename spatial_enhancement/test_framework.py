@@ -1,26 +1,54 @@
 """Testing framework for spatial enhancement modules."""
 
+import copy
 import json
+import os
 import time
 import math
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
-from enum import Enum
+from types import MappingProxyType
+import numpy as np
+from typing import Dict, Iterable, List, Any, NamedTuple, Optional, Tuple
+from dataclasses import dataclass, field, fields, replace
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum, IntEnum
 
-@dataclass
+try:
+    import orjson
+except ImportError:
+    # Optional faster encoder; fall back to the stdlib json module
+    orjson = None
+
+# slots=True requires py310+
+@dataclass(slots=True)
 class TestScenario:
     """Represents a test scenario for spatial reasoning."""
     scenario_id: str
     scene_name: str
     description: str
     instruction: str
-    candidate_objects: List[Dict[str, Any]]
+    candidate_objects: Optional[List[Dict[str, Any]]]  # None to take candidate_indices rows
     expected_object_id: Optional[str]
     expected_confidence_threshold: float
     test_type: str  # "ambiguity", "spatial", "geometric"
     metadata: Dict[str, Any]
+    # Array views of candidate_objects, filled by _precompute_arrays
+    object_ids: Optional[List[str]] = field(default=None, repr=False, compare=False)
+    positions: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    bbox_centers: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    bbox_sizes: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    visible_mask: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    # Rows of the shared candidate table; fills candidate_objects when given
+    candidate_indices: Optional[Tuple[int, ...]] = field(default=None, compare=False)
+    # Integer tag for test_type, set at construction (None for unknown types)
+    type_tag: Optional[int] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.candidate_objects is None and self.candidate_indices is not None:
+            self.candidate_objects = [copy.deepcopy(_CANDIDATE_OBJECTS[i]) for i in self.candidate_indices]
+        self.type_tag = _TEST_TYPE_TAGS.get(self.test_type)
 
-@dataclass 
+@dataclass(slots=True)
 class TestResult:
     """Results from running a test scenario."""
     scenario_id: str
@@ -32,6 +60,9 @@ class TestResult:
     enhancement_used: bool
     detailed_metrics: Dict[str, Any]
 
+# Slotted results have no __dict__; serialize them by field name
+_RESULT_FIELDS = tuple(f.name for f in fields(TestResult))
+
 class TestType(str, Enum):
     """Types of tests in the framework."""
     AMBIGUITY_RESOLUTION = "ambiguity"
@@ -39,276 +70,387 @@ class TestType(str, Enum):
     GEOMETRIC_ANALYSIS = "geometric"
     INTEGRATION = "integration"
 
+class _EnhancementModules(NamedTuple):
+    """Enhancement modules resolved once per suite run (None when missing)."""
+    ambiguity_detector: Any
+    spatial_calculator: Any
+    geometric_analyzer: Any
+
+class _TestTypeTag(IntEnum):
+    """Integer tags for TestType, compared instead of strings in hot paths."""
+    AMBIGUITY_RESOLUTION = 0
+    SPATIAL_CALCULATION = 1
+    GEOMETRIC_ANALYSIS = 2
+    INTEGRATION = 3
+
+# TestType is a str enum, so plain string test types map to the same tags
+_TEST_TYPE_TAGS = {test_type: _TestTypeTag[test_type.name] for test_type in TestType}
+
+_REPORT_HEADER = "\n".join(["=" * 60, "SPATIAL ENHANCEMENT TEST REPORT", "=" * 60, ""])
+
+def _elapsed(t0_ns: int) -> float:
+    """Seconds elapsed since a time.perf_counter_ns() reading."""
+    return (time.perf_counter_ns() - t0_ns) * 1e-9
+
+# Prototype for results of scenarios that could not run
+_ERROR_TEMPLATE = TestResult(
+    scenario_id='',
+    success=False,
+    selected_object_id=None,
+    confidence=0.0,
+    execution_time=0.0,
+    error_message=None,
+    enhancement_used=False,
+    detailed_metrics={}
+)
+
+def _error_result(scenario: TestScenario, message: str, t0_ns: int) -> TestResult:
+    """Build a failed TestResult for a scenario that could not run."""
+    return replace(
+        _ERROR_TEMPLATE,
+        scenario_id=scenario.scenario_id,
+        execution_time=_elapsed(t0_ns),
+        error_message=message,
+        detailed_metrics={}  # fresh dict so results never share metrics
+    )
+
+def _precompute_arrays(scenario: TestScenario):
+    """Extract candidate ids, positions, bboxes and visibility into arrays once.
+
+    Args:
+        scenario: Test scenario to populate
+    """
+    objects = scenario.candidate_objects
+
+    def xyz(point: Dict[str, float]) -> Tuple[float, float, float]:
+        return point.get('x', 0), point.get('y', 0), point.get('z', 0)
+
+    if scenario.candidate_indices is not None:
+        # Shared candidates: slice the structured table instead of walking dicts
+        rows = _CANDIDATES[list(scenario.candidate_indices)]
+        scenario.object_ids = rows['objectId'].tolist()
+        scenario.positions = np.stack([rows['x'], rows['y'], rows['z']], axis=1)
+        scenario.visible_mask = rows['visible'].copy()
+    else:
+        scenario.object_ids = [obj.get('objectId') for obj in objects]
+        scenario.positions = np.array(
+            [xyz(obj.get('position', {})) for obj in objects], dtype=np.float32
+        ).reshape(-1, 3)
+        scenario.visible_mask = np.fromiter(
+            (obj.get('visible', True) for obj in objects), dtype=bool, count=len(objects)
+        )
+    scenario.bbox_centers = np.array(
+        [xyz(obj.get('axisAlignedBoundingBox', {}).get('center', {})) for obj in objects],
+        dtype=np.float32
+    ).reshape(-1, 3)
+    scenario.bbox_sizes = np.array(
+        [xyz(obj.get('axisAlignedBoundingBox', {}).get('size', {})) for obj in objects],
+        dtype=np.float32
+    ).reshape(-1, 3)
+
+# Candidate objects for the scenario literals below. Scenarios refer to them by
+# row index; each scenario gets its own deep copy of the dicts it uses.
+_CANDIDATE_OBJECTS = (
+    {  # 0
+        "objectId": "Book|-00.47|+01.15|+00.48",
+        "objectType": "Book",
+        "position": {"x": -0.47, "y": 1.15, "z": 0.48},
+        "visible": True,
+        "parentReceptacles": ["CounterTop|-00.08|+01.15|00.00"]
+    },
+    {  # 1
+        "objectId": "Book|+01.23|+00.91|+00.31",
+        "objectType": "Book",
+        "position": {"x": 1.23, "y": 0.91, "z": 0.31},
+        "visible": True,
+        "parentReceptacles": ["DiningTable|+01.23|+00.00|+00.31"]
+    },
+    {  # 2
+        "objectId": "Book|+02.10|+01.45|+00.15",
+        "objectType": "Book",
+        "position": {"x": 2.10, "y": 1.45, "z": 0.15},
+        "visible": True,
+        "parentReceptacles": ["Shelf|+02.10|+01.45|+00.15"]
+    },
+    {  # 3: same shelf book, out of view
+        "objectId": "Book|+02.10|+01.45|+00.15",
+        "objectType": "Book",
+        "position": {"x": 2.10, "y": 1.45, "z": 0.15},
+        "visible": False,
+        "parentReceptacles": ["Shelf|+02.10|+01.45|+00.15"]
+    },
+    {  # 4
+        "objectId": "Sofa|+02.25|+00.57|+01.50",
+        "objectType": "Sofa",
+        "position": {"x": 2.25, "y": 0.57, "z": 1.50},
+        "visible": True,
+        "axisAlignedBoundingBox": {
+            "center": {"x": 2.25, "y": 0.57, "z": 1.50},
+            "size": {"x": 2.5, "y": 0.8, "z": 1.2}
+        },
+        "rotation": {"x": 0, "y": 0, "z": 0}
+    },
+    {  # 5
+        "objectId": "Cup|+00.25|+01.15|+00.30",
+        "objectType": "Cup",
+        "position": {"x": 0.25, "y": 1.15, "z": 0.30},
+        "visible": True,
+        "axisAlignedBoundingBox": {
+            "center": {"x": 0.25, "y": 1.15, "z": 0.30},
+            "size": {"x": 0.08, "y": 0.12, "z": 0.08}
+        },
+        "rotation": {"x": 0, "y": 0, "z": 0}
+    },
+    {  # 6: same cup without geometry metadata
+        "objectId": "Cup|+00.25|+01.15|+00.30",
+        "objectType": "Cup",
+        "position": {"x": 0.25, "y": 1.15, "z": 0.30},
+        "visible": True
+    },
+    {  # 7
+        "objectId": "Cup|+03.50|+01.15|+02.80",
+        "objectType": "Cup",
+        "position": {"x": 3.50, "y": 1.15, "z": 2.80},
+        "visible": True
+    },
+    {  # 8
+        "objectId": "Cup|+01.50|+01.15|+00.30",
+        "objectType": "Cup",
+        "position": {"x": 1.50, "y": 1.15, "z": 0.30},
+        "visible": True
+    }
+)
+
+_CANDIDATE_DTYPE = np.dtype([
+    ('objectId', 'U40'), ('x', 'f4'), ('y', 'f4'), ('z', 'f4'), ('visible', '?')
+])
+
+# Structured (SoA) view of _CANDIDATE_OBJECTS used to build scenario arrays
+_CANDIDATES = np.array([
+    (obj["objectId"], obj["position"]["x"], obj["position"]["y"], obj["position"]["z"],
+     obj.get("visible", True))
+    for obj in _CANDIDATE_OBJECTS
+], dtype=_CANDIDATE_DTYPE)
+
+# Scenario templates; _create_* hands out fresh copies so a scenario mutated by
+# one run never leaks into another
+_MULTI_BOOK_SCENARIOS = (
+    TestScenario(
+        scenario_id="multi_book_001",
+        scene_name="FloorPlan1",
+        description="Three books in kitchen - ambiguous reference",
+        instruction="拿起书",  # "pick up book" - ambiguous
+        candidate_objects=None,
+        expected_object_id=None,  # Should ask for clarification
+        expected_confidence_threshold=0.5,
+        test_type=TestType.AMBIGUITY_RESOLUTION,
+        metadata=MappingProxyType({"requires_clarification": True}),
+        candidate_indices=(0, 1, 3)
+    ),
+    TestScenario(
+        scenario_id="multi_book_002",
+        scene_name="FloorPlan1",
+        description="Three books - spatial reference to left book",
+        instruction="拿起左边的书",  # "pick up the left book"
+        candidate_objects=None,
+        expected_object_id="Book|-00.47|+01.15|+00.48",  # Leftmost book
+        expected_confidence_threshold=0.7,
+        test_type=TestType.SPATIAL_CALCULATION,
+        metadata=MappingProxyType({"spatial_constraint": "left"}),
+        candidate_indices=(0, 1, 2)
+    ),
+    TestScenario(
+        scenario_id="multi_book_003",
+        scene_name="FloorPlan1",
+        description="Three books - container reference",
+        instruction="拿起桌上的书",  # "pick up the book on the table"
+        candidate_objects=None,
+        expected_object_id="Book|+01.23|+00.91|+00.31",  # Book on dining table
+        expected_confidence_threshold=0.8,
+        test_type=TestType.SPATIAL_CALCULATION,
+        metadata=MappingProxyType({"container_constraint": "table"}),
+        candidate_indices=(0, 1, 2)
+    ),
+)
+
+_LARGE_OBJECT_SCENARIOS = (
+    TestScenario(
+        scenario_id="large_sofa_001",
+        scene_name="FloorPlan201",
+        description="L-shaped sofa observation strategy",
+        instruction="observe sofa",
+        candidate_objects=None,
+        expected_object_id="Sofa|+02.25|+00.57|+01.50",
+        expected_confidence_threshold=0.9,
+        test_type=TestType.GEOMETRIC_ANALYSIS,
+        metadata=MappingProxyType({"requires_multiview": True, "expected_viewpoints": 3}),
+        candidate_indices=(4,)
+    ),
+    TestScenario(
+        scenario_id="small_cup_001",
+        scene_name="FloorPlan1",
+        description="Small cup single view strategy",
+        instruction="observe cup",
+        candidate_objects=None,
+        expected_object_id="Cup|+00.25|+01.15|+00.30",
+        expected_confidence_threshold=0.95,
+        test_type=TestType.GEOMETRIC_ANALYSIS,
+        metadata=MappingProxyType({"requires_multiview": False, "expected_viewpoints": 1}),
+        candidate_indices=(5,)
+    ),
+)
+
+_SPATIAL_RELATIONSHIP_SCENARIOS = (
+    TestScenario(
+        scenario_id="spatial_proximity_001",
+        scene_name="FloorPlan1",
+        description="Near vs far object selection",
+        instruction="get the cup near me",
+        candidate_objects=None,
+        expected_object_id="Cup|+00.25|+01.15|+00.30",  # Closer cup
+        expected_confidence_threshold=0.8,
+        test_type=TestType.SPATIAL_CALCULATION,
+        metadata=MappingProxyType({"spatial_constraint": "near"}),
+        candidate_indices=(6, 7)
+    ),
+    TestScenario(
+        scenario_id="spatial_direction_001",
+        scene_name="FloorPlan1",
+        description="Directional object selection",
+        instruction="get the cup on the right",
+        candidate_objects=None,
+        expected_object_id="Cup|+01.50|+01.15|+00.30",  # Right cup
+        expected_confidence_threshold=0.8,
+        test_type=TestType.SPATIAL_CALCULATION,
+        metadata=MappingProxyType({"spatial_constraint": "right"}),
+        candidate_indices=(6, 8)
+    ),
+)
+
+_INTEGRATION_SCENARIOS = (
+    TestScenario(
+        scenario_id="integration_001",
+        scene_name="FloorPlan1",
+        description="Complex multi-constraint scenario",
+        instruction="拿起右边桌子上的书",  # "pick up the book on the right table"
+        candidate_objects=None,
+        expected_object_id="Book|+01.23|+00.91|+00.31",  # Book on right table
+        expected_confidence_threshold=0.7,
+        test_type=TestType.INTEGRATION,
+        metadata=MappingProxyType({"constraints": ["direction", "container"]}),
+        candidate_indices=(0, 1)
+    ),
+)
+
+def _fresh_scenarios(templates: Tuple[TestScenario, ...]) -> List[TestScenario]:
+    """Copy scenario templates with their own candidate dicts and metadata.
+
+    Candidate arrays are left unset; create_test_scenarios fills them.
+    """
+    return [
+        replace(template, candidate_objects=None,
+                metadata=copy.deepcopy(dict(template.metadata)),
+                object_ids=None, positions=None, bbox_centers=None,
+                bbox_sizes=None, visible_mask=None)
+        for template in templates
+    ]
+
 class SpatialEnhancementTestFramework:
     """Test framework for spatial enhancement modules."""
     
-    def __init__(self):
-        """Initialize the test framework."""
+    def __init__(self, parallel: bool = False, max_workers: Optional[int] = None):
+        """Initialize the test framework.
+        
+        Args:
+            parallel: Run scenarios concurrently in a thread pool; only enable
+                when the enhancement modules under test are thread-safe
+            max_workers: Thread pool size (defaults to os.cpu_count())
+        """
         self.test_scenarios = []
         self.test_results = []
         self.baseline_results = []
+        self._type_index = {}
+        self._type_index_source = None
+        # instruction -> spatial constraints, valid for one run_test_suite call
+        self._constraint_cache = {}
+        self.parallel = parallel
+        self.max_workers = max_workers or os.cpu_count()
+        self._dispatch = {
+            _TestTypeTag.AMBIGUITY_RESOLUTION: self._test_ambiguity_resolution,
+            _TestTypeTag.SPATIAL_CALCULATION: self._test_spatial_calculation,
+            _TestTypeTag.GEOMETRIC_ANALYSIS: self._test_geometric_analysis,
+            _TestTypeTag.INTEGRATION: self._test_integration
+        }
         
-    def create_test_scenarios(self) -> List[TestScenario]:
+    def create_test_scenarios(self, filter_types: Optional[Iterable[str]] = None) -> List[TestScenario]:
         """Create a comprehensive set of test scenarios.
         
+        Args:
+            filter_types: Only create scenarios of these test types (all if None)
+        
         Returns:
             List of test scenarios
         """
+        wanted = None if filter_types is None else set(filter_types)
         scenarios = []
         
-        # Multi-book scenario for ambiguity testing
-        scenarios.extend(self._create_multi_book_scenarios())
+        # Multi-book scenario for ambiguity testing (also holds spatial scenarios)
+        if wanted is None or wanted & {TestType.AMBIGUITY_RESOLUTION, TestType.SPATIAL_CALCULATION}:
+            scenarios.extend(self._create_multi_book_scenarios())
         
         # Large object scenarios for geometric testing
-        scenarios.extend(self._create_large_object_scenarios())
+        if wanted is None or TestType.GEOMETRIC_ANALYSIS in wanted:
+            scenarios.extend(self._create_large_object_scenarios())
         
         # Spatial relationship scenarios
-        scenarios.extend(self._create_spatial_relationship_scenarios())
+        if wanted is None or TestType.SPATIAL_CALCULATION in wanted:
+            scenarios.extend(self._create_spatial_relationship_scenarios())
         
         # Complex integration scenarios
-        scenarios.extend(self._create_integration_scenarios())
+        if wanted is None or TestType.INTEGRATION in wanted:
+            scenarios.extend(self._create_integration_scenarios())
+        
+        if wanted is not None:
+            scenarios = [scenario for scenario in scenarios if scenario.test_type in wanted]
+        
+        for scenario in scenarios:
+            if scenario.positions is None:
+                _precompute_arrays(scenario)
         
         self.test_scenarios = scenarios
+        self._build_type_index()
         return scenarios
     
+    def _build_type_index(self):
+        """Index scenario positions by test type, in first-appearance order."""
+        type_index = defaultdict(list)
+        for i, scenario in enumerate(self.test_scenarios):
+            type_index[scenario.test_type].append(i)
+        self._type_index = dict(type_index)
+        self._type_index_source = (self.test_scenarios, len(self.test_scenarios))
+    
+    def _get_type_index(self) -> Dict[str, List[int]]:
+        """Return the type index, rebuilding it if test_scenarios was replaced or resized."""
+        source, count = self._type_index_source or (None, -1)
+        if source is not self.test_scenarios or count != len(self.test_scenarios):
+            self._build_type_index()
+        return self._type_index
+    
     def _create_multi_book_scenarios(self) -> List[TestScenario]:
         """Create scenarios with multiple books for ambiguity testing."""
-        return [
-            TestScenario(
-                scenario_id="multi_book_001",
-                scene_name="FloorPlan1",
-                description="Three books in kitchen - ambiguous reference",
-                instruction="拿起书",  # "pick up book" - ambiguous
-                candidate_objects=[
-                    {
-                        "objectId": "Book|-00.47|+01.15|+00.48",
-                        "objectType": "Book",
-                        "position": {"x": -0.47, "y": 1.15, "z": 0.48},
-                        "visible": True,
-                        "parentReceptacles": ["CounterTop|-00.08|+01.15|00.00"]
-                    },
-                    {
-                        "objectId": "Book|+01.23|+00.91|+00.31", 
-                        "objectType": "Book",
-                        "position": {"x": 1.23, "y": 0.91, "z": 0.31},
-                        "visible": True,
-                        "parentReceptacles": ["DiningTable|+01.23|+00.00|+00.31"]
-                    },
-                    {
-                        "objectId": "Book|+02.10|+01.45|+00.15",
-                        "objectType": "Book", 
-                        "position": {"x": 2.10, "y": 1.45, "z": 0.15},
-                        "visible": False,
-                        "parentReceptacles": ["Shelf|+02.10|+01.45|+00.15"]
-                    }
-                ],
-                expected_object_id=None,  # Should ask for clarification
-                expected_confidence_threshold=0.5,
-                test_type=TestType.AMBIGUITY_RESOLUTION,
-                metadata={"requires_clarification": True}
-            ),
-            TestScenario(
-                scenario_id="multi_book_002", 
-                scene_name="FloorPlan1",
-                description="Three books - spatial reference to left book",
-                instruction="拿起左边的书",  # "pick up the left book"
-                candidate_objects=[
-                    {
-                        "objectId": "Book|-00.47|+01.15|+00.48",
-                        "objectType": "Book",
-                        "position": {"x": -0.47, "y": 1.15, "z": 0.48},
-                        "visible": True,
-                        "parentReceptacles": ["CounterTop|-00.08|+01.15|00.00"]
-                    },
-                    {
-                        "objectId": "Book|+01.23|+00.91|+00.31",
-                        "objectType": "Book", 
-                        "position": {"x": 1.23, "y": 0.91, "z": 0.31},
-                        "visible": True,
-                        "parentReceptacles": ["DiningTable|+01.23|+00.00|+00.31"]
-                    },
-                    {
-                        "objectId": "Book|+02.10|+01.45|+00.15",
-                        "objectType": "Book",
-                        "position": {"x": 2.10, "y": 1.45, "z": 0.15}, 
-                        "visible": True,
-                        "parentReceptacles": ["Shelf|+02.10|+01.45|+00.15"]
-                    }
-                ],
-                expected_object_id="Book|-00.47|+01.15|+00.48",  # Leftmost book
-                expected_confidence_threshold=0.7,
-                test_type=TestType.SPATIAL_CALCULATION,
-                metadata={"spatial_constraint": "left"}
-            ),
-            TestScenario(
-                scenario_id="multi_book_003",
-                scene_name="FloorPlan1", 
-                description="Three books - container reference",
-                instruction="拿起桌上的书",  # "pick up the book on the table"
-                candidate_objects=[
-                    {
-                        "objectId": "Book|-00.47|+01.15|+00.48",
-                        "objectType": "Book",
-                        "position": {"x": -0.47, "y": 1.15, "z": 0.48},
-                        "visible": True,
-                        "parentReceptacles": ["CounterTop|-00.08|+01.15|00.00"]
-                    },
-                    {
-                        "objectId": "Book|+01.23|+00.91|+00.31",
-                        "objectType": "Book",
-                        "position": {"x": 1.23, "y": 0.91, "z": 0.31},
-                        "visible": True,
-                        "parentReceptacles": ["DiningTable|+01.23|+00.00|+00.31"]
-                    },
-                    {
-                        "objectId": "Book|+02.10|+01.45|+00.15",
-                        "objectType": "Book",
-                        "position": {"x": 2.10, "y": 1.45, "z": 0.15},
-                        "visible": True,
-                        "parentReceptacles": ["Shelf|+02.10|+01.45|+00.15"]
-                    }
-                ],
-                expected_object_id="Book|+01.23|+00.91|+00.31",  # Book on dining table
-                expected_confidence_threshold=0.8,
-                test_type=TestType.SPATIAL_CALCULATION,
-                metadata={"container_constraint": "table"}
-            )
-        ]
+        return _fresh_scenarios(_MULTI_BOOK_SCENARIOS)
     
     def _create_large_object_scenarios(self) -> List[TestScenario]:
         """Create scenarios with large objects for geometric testing."""
-        return [
-            TestScenario(
-                scenario_id="large_sofa_001",
-                scene_name="FloorPlan201",
-                description="L-shaped sofa observation strategy",
-                instruction="observe sofa",
-                candidate_objects=[
-                    {
-                        "objectId": "Sofa|+02.25|+00.57|+01.50",
-                        "objectType": "Sofa",
-                        "position": {"x": 2.25, "y": 0.57, "z": 1.50},
-                        "visible": True,
-                        "axisAlignedBoundingBox": {
-                            "center": {"x": 2.25, "y": 0.57, "z": 1.50},
-                            "size": {"x": 2.5, "y": 0.8, "z": 1.2}
-                        },
-                        "rotation": {"x": 0, "y": 0, "z": 0}
-                    }
-                ],
-                expected_object_id="Sofa|+02.25|+00.57|+01.50",
-                expected_confidence_threshold=0.9,
-                test_type=TestType.GEOMETRIC_ANALYSIS,
-                metadata={"requires_multiview": True, "expected_viewpoints": 3}
-            ),
-            TestScenario(
-                scenario_id="small_cup_001", 
-                scene_name="FloorPlan1",
-                description="Small cup single view strategy",
-                instruction="observe cup",
-                candidate_objects=[
-                    {
-                        "objectId": "Cup|+00.25|+01.15|+00.30",
-                        "objectType": "Cup",
-                        "position": {"x": 0.25, "y": 1.15, "z": 0.30},
-                        "visible": True,
-                        "axisAlignedBoundingBox": {
-                            "center": {"x": 0.25, "y": 1.15, "z": 0.30},
-                            "size": {"x": 0.08, "y": 0.12, "z": 0.08}
-                        },
-                        "rotation": {"x": 0, "y": 0, "z": 0}
-                    }
-                ],
-                expected_object_id="Cup|+00.25|+01.15|+00.30",
-                expected_confidence_threshold=0.95,
-                test_type=TestType.GEOMETRIC_ANALYSIS,
-                metadata={"requires_multiview": False, "expected_viewpoints": 1}
-            )
-        ]
+        return _fresh_scenarios(_LARGE_OBJECT_SCENARIOS)
     
     def _create_spatial_relationship_scenarios(self) -> List[TestScenario]:
         """Create scenarios for testing spatial relationship calculations."""
-        return [
-            TestScenario(
-                scenario_id="spatial_proximity_001",
-                scene_name="FloorPlan1",
-                description="Near vs far object selection",
-                instruction="get the cup near me",
-                candidate_objects=[
-                    {
-                        "objectId": "Cup|+00.25|+01.15|+00.30",
-                        "objectType": "Cup", 
-                        "position": {"x": 0.25, "y": 1.15, "z": 0.30},
-                        "visible": True
-                    },
-                    {
-                        "objectId": "Cup|+03.50|+01.15|+02.80",
-                        "objectType": "Cup",
-                        "position": {"x": 3.50, "y": 1.15, "z": 2.80},
-                        "visible": True
-                    }
-                ],
-                expected_object_id="Cup|+00.25|+01.15|+00.30",  # Closer cup
-                expected_confidence_threshold=0.8,
-                test_type=TestType.SPATIAL_CALCULATION,
-                metadata={"spatial_constraint": "near"}
-            ),
-            TestScenario(
-                scenario_id="spatial_direction_001",
-                scene_name="FloorPlan1", 
-                description="Directional object selection",
-                instruction="get the cup on the right",
-                candidate_objects=[
-                    {
-                        "objectId": "Cup|+00.25|+01.15|+00.30",
-                        "objectType": "Cup",
-                        "position": {"x": 0.25, "y": 1.15, "z": 0.30},
-                        "visible": True
-                    },
-                    {
-                        "objectId": "Cup|+01.50|+01.15|+00.30", 
-                        "objectType": "Cup",
-                        "position": {"x": 1.50, "y": 1.15, "z": 0.30},
-                        "visible": True
-                    }
-                ],
-                expected_object_id="Cup|+01.50|+01.15|+00.30",  # Right cup
-                expected_confidence_threshold=0.8,
-                test_type=TestType.SPATIAL_CALCULATION,
-                metadata={"spatial_constraint": "right"}
-            )
-        ]
+        return _fresh_scenarios(_SPATIAL_RELATIONSHIP_SCENARIOS)
     
     def _create_integration_scenarios(self) -> List[TestScenario]:
         """Create scenarios for testing end-to-end integration."""
-        return [
-            TestScenario(
-                scenario_id="integration_001",
-                scene_name="FloorPlan1",
-                description="Complex multi-constraint scenario",
-                instruction="拿起右边桌子上的书",  # "pick up the book on the right table"
-                candidate_objects=[
-                    {
-                        "objectId": "Book|-00.47|+01.15|+00.48",
-                        "objectType": "Book",
-                        "position": {"x": -0.47, "y": 1.15, "z": 0.48},
-                        "visible": True,
-                        "parentReceptacles": ["CounterTop|-00.08|+01.15|00.00"]
-                    },
-                    {
-                        "objectId": "Book|+01.23|+00.91|+00.31",
-                        "objectType": "Book",
-                        "position": {"x": 1.23, "y": 0.91, "z": 0.31},
-                        "visible": True,
-                        "parentReceptacles": ["DiningTable|+01.23|+00.00|+00.31"]
-                    }
-                ],
-                expected_object_id="Book|+01.23|+00.91|+00.31",  # Book on right table
-                expected_confidence_threshold=0.7,
-                test_type=TestType.INTEGRATION,
-                metadata={"constraints": ["direction", "container"]}
-            )
-        ]
+        return _fresh_scenarios(_INTEGRATION_SCENARIOS)
     
     def run_test_suite(self, enhancement_modules: Dict[str, Any]) -> Dict[str, Any]:
         """Run the complete test suite.
@@ -331,96 +473,91 @@ class SpatialEnhancementTestFramework:
             'detailed_results': []
         }
         
-        start_time = time.time()
+        t0_ns = time.perf_counter_ns()
         
-        for scenario in self.test_scenarios:
-            test_result = self._run_single_test(scenario, enhancement_modules)
-            results['detailed_results'].append(test_result)
-            
-            if test_result.success:
-                results['passed'] += 1
-            else:
-                results['failed'] += 1
-            
-            # Group by test type
-            test_type = scenario.test_type
-            if test_type not in results['results_by_type']:
-                results['results_by_type'][test_type] = {'passed': 0, 'failed': 0, 'total': 0}
-            
-            results['results_by_type'][test_type]['total'] += 1
-            if test_result.success:
-                results['results_by_type'][test_type]['passed'] += 1
-            else:
-                results['results_by_type'][test_type]['failed'] += 1
+        # Modules may differ between runs, so cached constraints are per run
+        self._constraint_cache = {}
+        
+        # Resolve the modules once instead of per scenario
+        modules = _EnhancementModules(
+            enhancement_modules.get('ambiguity_detector'),
+            enhancement_modules.get('spatial_calculator'),
+            enhancement_modules.get('geometric_analyzer')
+        )
+        type_index = self._get_type_index()
+        
+        def run_scenario(scenario: TestScenario) -> TestResult:
+            return self._run_single_test(scenario, modules)
         
-        results['execution_time'] = time.time() - start_time
+        if self.parallel:
+            # executor.map preserves scenario order
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results['detailed_results'] = list(executor.map(run_scenario, self.test_scenarios))
+        else:
+            results['detailed_results'] = [run_scenario(scenario) for scenario in self.test_scenarios]
+        
+        # (tag, success) counts in one vectorised pass; unknown test types
+        # (tag -1) always produce failed results and are left out
+        n_results = len(results['detailed_results'])
+        tags = np.fromiter(
+            (-1 if scenario.type_tag is None else scenario.type_tag for scenario in self.test_scenarios),
+            dtype=np.intp, count=n_results
+        )
+        successes = np.fromiter(
+            (test_result.success for test_result in results['detailed_results']),
+            dtype=np.intp, count=n_results
+        )
+        known = tags >= 0
+        counts = np.zeros((len(_TestTypeTag), 2), dtype=np.int32)
+        np.add.at(counts, (tags[known], successes[known]), 1)
+        
+        results['passed'] = int(counts[:, 1].sum())
+        results['failed'] = n_results - results['passed']
+        
+        # Group by test type, in first-appearance order
+        for test_type, indices in type_index.items():
+            tag = _TEST_TYPE_TAGS.get(test_type)
+            passed = 0 if tag is None else int(counts[tag, 1])
+            results['results_by_type'][test_type] = {
+                'passed': passed,
+                'failed': len(indices) - passed,
+                'total': len(indices)
+            }
+        
+        results['execution_time'] = _elapsed(t0_ns)
         results['success_rate'] = results['passed'] / results['total_scenarios'] if results['total_scenarios'] > 0 else 0
         
         return results
     
     def _run_single_test(self, scenario: TestScenario, 
-                        enhancement_modules: Dict[str, Any]) -> TestResult:
+                        modules: _EnhancementModules) -> TestResult:
         """Run a single test scenario.
         
         Args:
             scenario: Test scenario to run
-            enhancement_modules: Enhancement modules to test
+            modules: Resolved enhancement modules to test
             
         Returns:
             Test result
         """
-        start_time = time.time()
+        t0_ns = time.perf_counter_ns()
         
         try:
-            if scenario.test_type == TestType.AMBIGUITY_RESOLUTION:
-                return self._test_ambiguity_resolution(scenario, enhancement_modules)
-            elif scenario.test_type == TestType.SPATIAL_CALCULATION:
-                return self._test_spatial_calculation(scenario, enhancement_modules)
-            elif scenario.test_type == TestType.GEOMETRIC_ANALYSIS:
-                return self._test_geometric_analysis(scenario, enhancement_modules)
-            elif scenario.test_type == TestType.INTEGRATION:
-                return self._test_integration(scenario, enhancement_modules)
+            handler = self._dispatch.get(scenario.type_tag)
+            if handler is not None:
+                return handler(scenario, modules, t0_ns)
             else:
-                return TestResult(
-                    scenario_id=scenario.scenario_id,
-                    success=False,
-                    selected_object_id=None,
-                    confidence=0.0,
-                    execution_time=time.time() - start_time,
-                    error_message=f"Unknown test type: {scenario.test_type}",
-                    enhancement_used=False,
-                    detailed_metrics={}
-                )
+                return _error_result(scenario, f"Unknown test type: {scenario.test_type}", t0_ns)
                 
         except Exception as e:
-            return TestResult(
-                scenario_id=scenario.scenario_id,
-                success=False,
-                selected_object_id=None,
-                confidence=0.0,
-                execution_time=time.time() - start_time,
-                error_message=str(e),
-                enhancement_used=False,
-                detailed_metrics={}
-            )
+            return _error_result(scenario, str(e), t0_ns)
     
     def _test_ambiguity_resolution(self, scenario: TestScenario,
-                                 enhancement_modules: Dict[str, Any]) -> TestResult:
+                                 modules: _EnhancementModules, t0_ns: int) -> TestResult:
         """Test ambiguity resolution capability."""
-        start_time = time.time()
-        
-        ambiguity_detector = enhancement_modules.get('ambiguity_detector')
+        ambiguity_detector = modules.ambiguity_detector
         if not ambiguity_detector:
-            return TestResult(
-                scenario_id=scenario.scenario_id,
-                success=False,
-                selected_object_id=None,
-                confidence=0.0,
-                execution_time=time.time() - start_time,
-                error_message="Ambiguity detector not available",
-                enhancement_used=False,
-                detailed_metrics={}
-            )
+            return _error_result(scenario, "Ambiguity detector not available", t0_ns)
         
         # Run ambiguity detection
         ambiguity_result = ambiguity_detector.detect_ambiguity(
@@ -444,7 +581,7 @@ class SpatialEnhancementTestFramework:
             success=success,
             selected_object_id=ambiguity_result.selected_object_id,
             confidence=ambiguity_result.confidence,
-            execution_time=time.time() - start_time,
+            execution_time=_elapsed(t0_ns),
             error_message=None,
             enhancement_used=True,
             detailed_metrics={
@@ -455,22 +592,11 @@ class SpatialEnhancementTestFramework:
         )
     
     def _test_spatial_calculation(self, scenario: TestScenario,
-                                enhancement_modules: Dict[str, Any]) -> TestResult:
+                                modules: _EnhancementModules, t0_ns: int) -> TestResult:
         """Test spatial calculation capability."""
-        start_time = time.time()
-        
-        spatial_calculator = enhancement_modules.get('spatial_calculator')
+        spatial_calculator = modules.spatial_calculator
         if not spatial_calculator:
-            return TestResult(
-                scenario_id=scenario.scenario_id,
-                success=False,
-                selected_object_id=None,
-                confidence=0.0,
-                execution_time=time.time() - start_time,
-                error_message="Spatial calculator not available",
-                enhancement_used=False,
-                detailed_metrics={}
-            )
+            return _error_result(scenario, "Spatial calculator not available", t0_ns)
         
         # Test spatial relationship calculation
         best_match, confidence = spatial_calculator.find_best_spatial_match(
@@ -485,31 +611,28 @@ class SpatialEnhancementTestFramework:
             success=success,
             selected_object_id=best_match,
             confidence=confidence,
-            execution_time=time.time() - start_time,
+            execution_time=_elapsed(t0_ns),
             error_message=None,
             enhancement_used=True,
             detailed_metrics={
-                'spatial_constraints': spatial_calculator.extract_spatial_constraints(scenario.instruction)
+                'spatial_constraints': self._spatial_constraints(spatial_calculator, scenario.instruction)
             }
         )
     
+    def _spatial_constraints(self, spatial_calculator: Any, instruction: str) -> Dict[str, List[str]]:
+        """Extract spatial constraints, reusing results for repeated instructions."""
+        constraints = self._constraint_cache.get(instruction)
+        if constraints is None:
+            constraints = spatial_calculator.extract_spatial_constraints(instruction)
+            self._constraint_cache[instruction] = constraints
+        return constraints
+    
     def _test_geometric_analysis(self, scenario: TestScenario,
-                               enhancement_modules: Dict[str, Any]) -> TestResult:
+                               modules: _EnhancementModules, t0_ns: int) -> TestResult:
         """Test geometric analysis capability."""
-        start_time = time.time()
-        
-        geometric_analyzer = enhancement_modules.get('geometric_analyzer')
+        geometric_analyzer = modules.geometric_analyzer
         if not geometric_analyzer:
-            return TestResult(
-                scenario_id=scenario.scenario_id,
-                success=False,
-                selected_object_id=None,
-                confidence=0.0,
-                execution_time=time.time() - start_time,
-                error_message="Geometric analyzer not available",
-                enhancement_used=False,
-                detailed_metrics={}
-            )
+            return _error_result(scenario, "Geometric analyzer not available", t0_ns)
         
         # Test observation strategy analysis
         target_object = scenario.candidate_objects[0]
@@ -532,7 +655,7 @@ class SpatialEnhancementTestFramework:
             success=success,
             selected_object_id=target_object.get('objectId'),
             confidence=1.0 if success else 0.0,
-            execution_time=time.time() - start_time,
+            execution_time=_elapsed(t0_ns),
             error_message=None,
             enhancement_used=True,
             detailed_metrics={
@@ -543,25 +666,14 @@ class SpatialEnhancementTestFramework:
         )
     
     def _test_integration(self, scenario: TestScenario,
-                        enhancement_modules: Dict[str, Any]) -> TestResult:
+                        modules: _EnhancementModules, t0_ns: int) -> TestResult:
         """Test end-to-end integration."""
-        start_time = time.time()
-        
         # Use both spatial calculator and ambiguity detector
-        spatial_calculator = enhancement_modules.get('spatial_calculator')
-        ambiguity_detector = enhancement_modules.get('ambiguity_detector')
+        spatial_calculator = modules.spatial_calculator
+        ambiguity_detector = modules.ambiguity_detector
         
         if not spatial_calculator or not ambiguity_detector:
-            return TestResult(
-                scenario_id=scenario.scenario_id,
-                success=False,
-                selected_object_id=None,
-                confidence=0.0,
-                execution_time=time.time() - start_time,
-                error_message="Required modules not available",
-                enhancement_used=False,
-                detailed_metrics={}
-            )
+            return _error_result(scenario, "Required modules not available", t0_ns)
         
         # Run full disambiguation pipeline
         ambiguity_result = ambiguity_detector.heuristic_object_selection(
@@ -576,7 +688,7 @@ class SpatialEnhancementTestFramework:
             success=success,
             selected_object_id=ambiguity_result.selected_object_id,
             confidence=ambiguity_result.confidence,
-            execution_time=time.time() - start_time,
+            execution_time=_elapsed(t0_ns),
             error_message=None,
             enhancement_used=True,
             detailed_metrics={
@@ -594,18 +706,14 @@ class SpatialEnhancementTestFramework:
         Returns:
             Formatted test report
         """
-        report = []
-        report.append("=" * 60)
-        report.append("SPATIAL ENHANCEMENT TEST REPORT")
-        report.append("=" * 60)
-        report.append("")
+        report = [_REPORT_HEADER]
         
         # Summary
-        report.append(f"Total Scenarios: {results['total_scenarios']}")
-        report.append(f"Passed: {results['passed']}")
-        report.append(f"Failed: {results['failed']}")
-        report.append(f"Success Rate: {results['success_rate']:.2%}")
-        report.append(f"Execution Time: {results['execution_time']:.2f}s")
+        report.append("Total Scenarios: %d" % results['total_scenarios'])
+        report.append("Passed: %d" % results['passed'])
+        report.append("Failed: %d" % results['failed'])
+        report.append("Success Rate: %.2f%%" % (results['success_rate'] * 100))
+        report.append("Execution Time: %.2fs" % results['execution_time'])
         report.append("")
         
         # Results by type
@@ -615,7 +723,7 @@ class SpatialEnhancementTestFramework:
             total = type_results['total']
             passed = type_results['passed']
             rate = passed / total if total > 0 else 0
-            report.append(f"{test_type}: {passed}/{total} ({rate:.2%})")
+            report.append("%s: %d/%d (%.2f%%)" % (test_type, passed, total, rate * 100))
         report.append("")
         
         # Detailed results
@@ -623,9 +731,10 @@ class SpatialEnhancementTestFramework:
         report.append("-" * 30)
         for result in results['detailed_results']:
             status = "PASS" if result.success else "FAIL"
-            report.append(f"[{status}] {result.scenario_id}: confidence={result.confidence:.2f}, time={result.execution_time:.3f}s")
+            report.append("[%s] %s: confidence=%.2f, time=%.3fs" % (
+                status, result.scenario_id, result.confidence, result.execution_time))
             if result.error_message:
-                report.append(f"    Error: {result.error_message}")
+                report.append("    Error: %s" % result.error_message)
         
         return "\n".join(report)
     
@@ -636,11 +745,25 @@ class SpatialEnhancementTestFramework:
             results: Test results to save
             filepath: Output file path
         """
-        # Convert TestResult dataclasses to dicts for JSON serialization
-        serializable_results = results.copy()
-        serializable_results['detailed_results'] = [
-            asdict(result) for result in results['detailed_results']
-        ]
+        # Convert TestResult dataclasses to dicts for JSON serialization; metrics
+        # are plain JSON values, so a shallow field walk avoids asdict's deep copy
+        # Built in one pass (keeping key order) rather than copying and overwriting
+        serializable_results = {
+            key: [
+                {name: getattr(result, name) for name in _RESULT_FIELDS}
+                for result in value
+            ] if key == 'detailed_results' else value
+            for key, value in results.items()
+        }
+        
+        if orjson is not None:
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(
+                    serializable_results,
+                    default=str,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                ))
+            return
         
         with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(serializable_results, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+            json.dump(serializable_results, f, indent=2, ensure_ascii=False, default=str)
\ No newline at end of file
@@ -1,18 +1,108 @@
 """VLM Response Parser for handling numbered object references like 'vase1', 'book2', etc."""
 
+import functools
 import re
 import math
-from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Compiled once per process and shared by every parser instance.
+# Match patterns like 'vase1', 'book2', 'apple12' in lower-cased text; an
+# action prefix such as 'navigate to' needs no pattern of its own since
+# search() skips it anyway
+_NUMBER_PATTERN = re.compile(r'([a-z]+)(\d+)', re.ASCII)
+
+
+# Keyword groups in priority order; plain substring alternations, so 'closet'
+# still counts as 'close' just like the former `word in text` checks
+_STRATEGY_PATTERNS = (
+    (re.compile(r'left|right|beside|next'), 'spatial_left_to_right'),
+    (re.compile(r'near|close'), 'distance_based'),  # 'closest' contains 'close'
+    (re.compile(r'visible|see|look'), 'visibility_based'),
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _cos_sin_deg(angle_deg: float) -> Tuple[float, float]:
+    """Cosine and sine of an agent rotation; AI2-THOR uses a few discrete angles."""
+    theta = math.radians(angle_deg)
+    return math.cos(theta), math.sin(theta)
+
+
+@functools.lru_cache(maxsize=256)
+def _lower_type(object_type: str) -> str:
+    """Lower-case an objectType once; scenes only have a few distinct types."""
+    return object_type.lower()
+
+
+def _position_key(obj: Dict[str, Any]) -> Tuple[float, float]:
+    """Sort key: left to right (x), then front to back (z)."""
+    try:
+        # AI2-THOR metadata always carries a full position; subscripting
+        # skips two method calls and a default dict per key
+        pos = obj['position']
+        return (pos['x'], pos['z'])
+    except KeyError:
+        pos = obj.get('position', {})
+        return (pos.get('x', 0), pos.get('z', 0))
+
+
+def _left_to_right_key(agent_position: Optional[Dict[str, Any]]) -> Callable[[Dict[str, Any]], float]:
+    """Sort key: x relative to the agent's facing, or world x without an agent.
+    
+    Matches calculate_relative_x_position, with the rotation's cos and sin
+    taken once per sort instead of once per object.
+    """
+    if not agent_position:
+        return lambda obj: _position_key(obj)[0]
+    agent_x = agent_position.get('x', 0)
+    agent_z = agent_position.get('z', 0)
+    cos_rot, sin_rot = _cos_sin_deg(agent_position.get('rotation', {}).get('y', 0))
+    
+    def key(obj: Dict[str, Any]) -> float:
+        x, z = _position_key(obj)
+        return (x - agent_x) * cos_rot + (z - agent_z) * sin_rot
+    return key
+
+
+def _distance_key(agent_position: Dict[str, Any]) -> Callable[[Dict[str, Any]], float]:
+    """Sort key: ground-plane distance to the agent, as in calculate_distance."""
+    agent_x = agent_position.get('x', 0)
+    agent_z = agent_position.get('z', 0)
+    
+    def key(obj: Dict[str, Any]) -> float:
+        x, z = _position_key(obj)
+        dx = x - agent_x
+        dz = z - agent_z
+        return math.sqrt(dx * dx + dz * dz)
+    return key
+
+
+def _visibility_key(obj: Dict[str, Any]) -> Tuple[bool, float]:
+    """Sort key: visible objects first, then world x."""
+    return (not obj.get('visible', False), _position_key(obj)[0])
+
+
+def _to_soa(objects: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Extract the fields the sorting strategies use into parallel arrays.
+    
+    Args:
+        objects: List of objects
+        
+    Returns:
+        Dictionary with 'x', 'z' (float64) and 'visible' (bool) arrays of length N
+    """
+    xz = np.asarray([_position_key(obj) for obj in objects], dtype=np.float64).reshape(-1, 2)
+    visible = np.fromiter((bool(obj.get('visible', False)) for obj in objects),
+                          dtype=bool, count=len(objects))
+    return {'x': xz[:, 0], 'z': xz[:, 1], 'visible': visible}
 
 class VLMResponseParser:
     """Parse VLM responses that contain numbered object references."""
     
     def __init__(self):
         """Initialize the parser with regex patterns."""
-        # Match patterns like 'vase1', 'book2', 'apple3', etc.
-        self.number_pattern = re.compile(r'(\w+)(\d+)')
-        # Match patterns like 'navigate to vase1', 'pick up book2', etc.
-        self.action_pattern = re.compile(r'(?:navigate to|pick up|go to|get|take)?\s*(\w+)(\d+)', re.IGNORECASE)
+        self.number_pattern = _NUMBER_PATTERN
         
     def parse_numbered_response(self, vlm_response: str, candidate_objects: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """Parse VLM response for numbered object references.
@@ -24,24 +114,19 @@ class VLMResponseParser:
         Returns:
             Selected object dict or None if parsing fails
         """
-        # Clean the response
-        vlm_response = vlm_response.strip().lower()
-        
-        # Try action pattern first, then number pattern
-        for pattern in [self.action_pattern, self.number_pattern]:
-            match = pattern.search(vlm_response)
-            if match:
-                object_type = match.group(1)
-                object_number = int(match.group(2))
-                
-                # Find objects of the specified type
-                same_type_objects = [obj for obj in candidate_objects 
-                                   if object_type in obj.get('objectType', '').lower()]
-                
-                if len(same_type_objects) >= object_number:
-                    # Sort objects consistently and return the indexed one
-                    sorted_objects = self.sort_objects_consistently(same_type_objects)
-                    return sorted_objects[object_number - 1]  # 1-based indexing
+        match = self.number_pattern.search(vlm_response.lower())
+        if match:
+            object_type = match.group(1)
+            object_number = int(match.group(2))
+            
+            # Find objects of the specified type
+            same_type_objects = [obj for obj in candidate_objects 
+                               if object_type in _lower_type(obj.get('objectType', ''))]
+            
+            if len(same_type_objects) >= object_number:
+                # Sort objects consistently and return the indexed one
+                sorted_objects = self.sort_objects_consistently(same_type_objects)
+                return sorted_objects[object_number - 1]  # 1-based indexing
         
         return None
     
@@ -54,13 +139,8 @@ class VLMResponseParser:
         Returns:
             Sorted list of objects
         """
-        def get_position(obj):
-            """Get position for sorting."""
-            pos = obj.get('position', {})
-            return (pos.get('x', 0), pos.get('z', 0))
-        
         # Sort by position: left to right (x), then front to back (z)
-        return sorted(objects, key=get_position)
+        return sorted(objects, key=_position_key)
     
     def contains_numbered_reference(self, response: str) -> bool:
         """Check if response contains numbered object references.
@@ -111,14 +191,7 @@ class SmartObjectSorting:
         Returns:
             Sorted list of objects
         """
-        if agent_position:
-            # Calculate relative position to agent
-            return sorted(objects, key=lambda obj: 
-                self.calculate_relative_x_position(obj, agent_position)
-            )
-        else:
-            # Use world coordinates
-            return sorted(objects, key=lambda obj: obj.get('position', {}).get('x', 0))
+        return sorted(objects, key=_left_to_right_key(agent_position))
     
     def sort_by_distance(self, objects: List[Dict[str, Any]], 
                         agent_position: Dict[str, Any]) -> List[Dict[str, Any]]:
@@ -131,9 +204,7 @@ class SmartObjectSorting:
         Returns:
             Sorted list of objects
         """
-        return sorted(objects, key=lambda obj:
-            self.calculate_distance(obj.get('position', {}), agent_position)
-        )
+        return sorted(objects, key=_distance_key(agent_position))
     
     def sort_by_visibility(self, objects: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Sort objects by visibility (visible first).
@@ -144,10 +215,56 @@ class SmartObjectSorting:
         Returns:
             Sorted list of objects
         """
-        return sorted(objects, key=lambda obj: (
-            not obj.get('visible', False),  # Visible objects first
-            obj.get('position', {}).get('x', 0)  # Then by position
-        ))
+        return sorted(objects, key=_visibility_key)
+    
+    def order_by_left_to_right(self, soa: Dict[str, np.ndarray],
+                               agent_position: Optional[Dict[str, Any]] = None) -> np.ndarray:
+        """Stable left-to-right permutation of objects given as arrays.
+        
+        Args:
+            soa: Object arrays from _to_soa
+            agent_position: Optional agent position for relative sorting
+            
+        Returns:
+            Indices of the objects in sorted order
+        """
+        if agent_position:
+            # Relative X position to agent, as in calculate_relative_x_position
+            cos_rot, sin_rot = _cos_sin_deg(agent_position.get('rotation', {}).get('y', 0))
+            dx = soa['x'] - agent_position.get('x', 0)
+            dz = soa['z'] - agent_position.get('z', 0)
+            keys = dx * cos_rot + dz * sin_rot
+        else:
+            # Use world coordinates
+            keys = soa['x']
+        return np.argsort(keys, kind='stable')
+    
+    def order_by_distance(self, soa: Dict[str, np.ndarray],
+                          agent_position: Dict[str, Any]) -> np.ndarray:
+        """Stable nearest-first permutation of objects given as arrays.
+        
+        Args:
+            soa: Object arrays from _to_soa
+            agent_position: Agent position
+            
+        Returns:
+            Indices of the objects in sorted order
+        """
+        dx = soa['x'] - agent_position.get('x', 0)
+        dz = soa['z'] - agent_position.get('z', 0)
+        return np.argsort(np.sqrt(dx * dx + dz * dz), kind='stable')
+    
+    def order_by_visibility(self, soa: Dict[str, np.ndarray]) -> np.ndarray:
+        """Stable visible-first, then left-to-right permutation of objects given as arrays.
+        
+        Args:
+            soa: Object arrays from _to_soa
+            
+        Returns:
+            Indices of the objects in sorted order
+        """
+        # lexsort sorts by the last key first and is stable
+        return np.lexsort((soa['x'], ~soa['visible']))
     
     def get_optimal_sorting_strategy(self, instruction: str) -> str:
         """Get the optimal sorting strategy based on instruction.
@@ -160,14 +277,10 @@ class SmartObjectSorting:
         """
         instruction_lower = instruction.lower()
         
-        if any(word in instruction_lower for word in ['left', 'right', 'beside', 'next']):
-            return 'spatial_left_to_right'
-        elif any(word in instruction_lower for word in ['near', 'close', 'closest']):
-            return 'distance_based'
-        elif any(word in instruction_lower for word in ['visible', 'see', 'look']):
-            return 'visibility_based'
-        else:
-            return 'default'
+        for pattern, strategy in _STRATEGY_PATTERNS:
+            if pattern.search(instruction_lower):
+                return strategy
+        return 'default'
     
     def calculate_relative_x_position(self, obj: Dict[str, Any], 
                                     agent_position: Dict[str, Any]) -> float:
@@ -191,8 +304,7 @@ class SmartObjectSorting:
         agent_rotation = agent_pos.get('rotation', {}).get('y', 0)
         
         # Transform to agent's coordinate system
-        cos_rot = math.cos(math.radians(agent_rotation))
-        sin_rot = math.sin(math.radians(agent_rotation))
+        cos_rot, sin_rot = _cos_sin_deg(agent_rotation)
         
         # Relative X position (left-right from agent's perspective)
         relative_x = dx * cos_rot + dz * sin_rot
@@ -239,21 +351,20 @@ class EnhancedAmbiguityResolver:
         Returns:
             Dictionary with resolution result
         """
-        # Check if VLM response contains numbered reference
-        if self.response_parser.contains_numbered_reference(vlm_response):
-            selected_object = self.response_parser.parse_numbered_response(
-                vlm_response, candidate_objects
-            )
-            
-            if selected_object:
-                return {
-                    'selected_object_id': selected_object.get('objectId'),
-                    'selected_object': selected_object,
-                    'confidence': 0.8,  # Numbered responses are usually reliable
-                    'method': 'vlm_numbered_response',
-                    'original_response': vlm_response,
-                    'reasoning': f"VLM provided numbered reference: {vlm_response}"
-                }
+        # Parse a numbered reference; None when the response has none
+        selected_object = self.response_parser.parse_numbered_response(
+            vlm_response, candidate_objects
+        )
+        
+        if selected_object:
+            return {
+                'selected_object_id': selected_object.get('objectId'),
+                'selected_object': selected_object,
+                'confidence': 0.8,  # Numbered responses are usually reliable
+                'method': 'vlm_numbered_response',
+                'original_response': vlm_response,
+                'reasoning': f"VLM provided numbered reference: {vlm_response}"
+            }
         
         # Fallback to spatial reasoning
         return self.fallback_to_spatial_reasoning(instruction, candidate_objects, agent_position)
@@ -282,16 +393,15 @@ class EnhancedAmbiguityResolver:
         # Get optimal sorting strategy
         strategy = self.object_sorter.get_optimal_sorting_strategy(instruction)
         
-        # Sort objects using the selected strategy
+        # Select the first object in the strategy's order; min() returns the
+        # first of equal keys, like the stable sorts in SmartObjectSorting
         if strategy == 'distance_based' and agent_position:
-            sorted_objects = self.object_sorter.sort_by_distance(candidate_objects, agent_position)
+            key = _distance_key(agent_position)
         elif strategy == 'visibility_based':
-            sorted_objects = self.object_sorter.sort_by_visibility(candidate_objects)
+            key = _visibility_key
         else:
-            sorted_objects = self.object_sorter.sort_by_left_to_right(candidate_objects, agent_position)
-        
-        # Select the first object from sorted list
-        selected_object = sorted_objects[0]
+            key = _left_to_right_key(agent_position)
+        selected_object = min(candidate_objects, key=key)
         
         return {
             'selected_object_id': selected_object.get('objectId'),
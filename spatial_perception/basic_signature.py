@@ -7,6 +7,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from typing import Dict, Any
+import functools
 import math
 import numpy as np
 
@@ -15,11 +16,15 @@ __all__ = [
     "rotation_matrix_y",
 ]
 
+@functools.lru_cache(maxsize=1024)
 def rotation_matrix_y(angle_deg: float) -> np.ndarray:
-    """生成绕 Y 轴旋转的 3×3 矩阵 (右手坐标系)。"""
+    """生成绕 Y 轴旋转的 3×3 矩阵 (右手坐标系)。
+
+    AI2-THOR 物体朝向多为少数离散角度, 按角度缓存; 返回的矩阵被共享, 因此只读。
+    """
     theta = math.radians(angle_deg)
     cos_t, sin_t = math.cos(theta), math.sin(theta)
-    return np.array(
+    mat = np.array(
         [
             [cos_t, 0.0, sin_t],
             [0.0, 1.0, 0.0],
@@ -27,9 +32,12 @@ def rotation_matrix_y(angle_deg: float) -> np.ndarray:
         ],
         dtype=float,
     )
+    mat.setflags(write=False)
+    return mat
 
 
-@dataclass
+# slots=True requires py310+
+@dataclass(slots=True)
 class SpatialSignature:
     """轻量级空间签名.
 
@@ -59,6 +67,7 @@ class SpatialSignature:
     # 便捷属性
     @property
     def half_size(self) -> np.ndarray:
+        # 按需计算, 重新赋值 size 后也不会过期
         return self.size / 2.0
 
     # ---------- 工厂方法 ----------
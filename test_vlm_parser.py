@@ -5,7 +5,7 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'spatial_enhancement'))
 
-from spatial_enhancement.vlm_response_parser import VLMResponseParser, EnhancedAmbiguityResolver
+from spatial_enhancement.vlm_response_parser import VLMResponseParser, EnhancedAmbiguityResolver, SmartObjectSorting, _to_soa
 
 def test_vlm_response_parser():
     """Test VLM response parser with sample data."""
@@ -76,5 +76,49 @@ def test_vlm_response_parser():
     print(f"\nFallback Response: '{vlm_response_no_number}'")
     print(f"Fallback Result: {result_fallback}")
 
+def test_array_orderings():
+    """order_by_* on _to_soa arrays must match the sort_by_* list results."""
+    print("\n=== Testing Array Orderings ===")
+    
+    sorter = SmartObjectSorting()
+    
+    def vase(i, x, z, visible=True):
+        return {
+            'objectId': f'Vase_{i}',
+            'objectType': 'Vase',
+            'position': {'x': x, 'y': 0.5, 'z': z},
+            'visible': visible
+        }
+    
+    object_lists = [
+        [],
+        [vase(1, 1.0, 2.0)],
+        [vase(1, 1.0, 2.0), vase(2, 3.0, 2.0), vase(3, -1.0, 0.5, False)],
+        # Ties on x and on distance keep their input order
+        [vase(1, 1.0, 0.0, False), vase(2, 0.0, 1.0), vase(3, 1.0, 3.0), vase(4, -1.0, 0.0, False)],
+    ]
+    agent_positions = [
+        {'x': 0.0, 'y': 0.9, 'z': 0.0, 'rotation': {'x': 0, 'y': 0, 'z': 0}},
+        {'x': 0.5, 'y': 0.9, 'z': -1.0, 'rotation': {'x': 0, 'y': 90, 'z': 0}},
+        {'x': -1.0, 'y': 0.9, 'z': 2.0, 'rotation': {'x': 0, 'y': 270, 'z': 0}},
+    ]
+    
+    for objects in object_lists:
+        soa = _to_soa(objects)
+        
+        def ordered(order):
+            return [objects[i] for i in order]
+        
+        assert ordered(sorter.order_by_visibility(soa)) == sorter.sort_by_visibility(objects)
+        assert ordered(sorter.order_by_left_to_right(soa)) == sorter.sort_by_left_to_right(objects)
+        for agent_position in agent_positions:
+            assert ordered(sorter.order_by_left_to_right(soa, agent_position)) == \
+                sorter.sort_by_left_to_right(objects, agent_position)
+            assert ordered(sorter.order_by_distance(soa, agent_position)) == \
+                sorter.sort_by_distance(objects, agent_position)
+    
+    print(f"  ✅ Array orderings match list sorts for {len(object_lists)} object lists")
+
 if __name__ == "__main__":
-    test_vlm_response_parser()
\ No newline at end of file
+    test_vlm_response_parser()
+    test_array_orderings()
\ No newline at end of file